@@ -0,0 +1,146 @@
+"""Time each phase of a liccheck run on a synthetic environment
+
+Usage: python benchmarks/process_phases.py [--packages N] [--shape SHAPE]
+           [--description-size BYTES] [--repeat N] [--max-paths N]
+           [--output FILE] [--compare FILE] [--label LABEL]
+
+The installed liccheck's ``process`` is run on the generated environment,
+which is put first on sys.path, with a reporting file.  The phases are the
+ones timed by ``--stats``: parsing the requirements, resolving them against
+the installed distributions, reading the metadata, checking the licenses and
+reporting.  Versions without ``--stats`` only give the total time, so that
+--compare still works with them.  The best time of each phase is printed,
+and written as JSON with --output; --compare prints the ratio with the
+results of a previous run, e.g. of another liccheck version.
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import synthetic_env
+
+PHASES = ("parse", "resolve", "metadata", "check", "report", "total")
+
+
+def run_phases(requirements_file, strategy_file, report_file, max_paths=None):
+    """Run process once and return the durations of its phases in seconds,
+    and the number of packages checked (None if unknown)"""
+    from liccheck import command_line
+
+    # start from cold memos, as a new liccheck process would
+    for name in ("_license_options", "coerce_version"):
+        memo = getattr(command_line, name, None)
+        if hasattr(memo, "cache_clear"):
+            memo.cache_clear()
+    strategy = command_line.Strategy.from_config(strategy_file)
+
+    parameters = inspect.signature(command_line.process).parameters
+    options = {}
+    if "max_paths" in parameters:
+        options["max_paths"] = max_paths
+    stats = None
+    if "stats" in parameters:
+        from liccheck.stats import Stats
+
+        stats = options["stats"] = Stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        command_line.process(
+            requirements_file,
+            strategy,
+            command_line.Level.STANDARD,
+            report_file,
+            **options
+        )
+    total = time.perf_counter() - start
+    if stats is None:
+        return {"total": total}, None
+    timings = dict(stats.phases)
+    timings["total"] = total
+    return timings, stats.counters["packages_checked"]
+
+
+def compare(results, previous):
+    print("compared with {}:".format(previous.get("label") or "previous results"))
+    for phase in PHASES:
+        before = previous["phases"].get(phase)
+        after = results["phases"].get(phase)
+        if before and after:
+            print("  {:<10} {:6.2f}x".format(phase, after / before))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    synthetic_env.add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-paths",
+        type=int,
+        help="as liccheck --max-paths, the number of dependency paths printed "
+        "per package",
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--label", help="label of the results, e.g. a version")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="liccheck_bench_")
+    try:
+        site_packages, requirements, strategy = synthetic_env.generate(
+            directory, args.packages, args.shape, args.description_size, args.seed
+        )
+        # before liccheck is imported, as older versions use pkg_resources,
+        # which scans sys.path once
+        sys.path.insert(0, site_packages)
+        report = os.path.join(directory, "report.txt")
+        best = {}
+        for _ in range(args.repeat):
+            timings, checked = run_phases(
+                requirements, strategy, report, max_paths=args.max_paths
+            )
+            for phase, duration in timings.items():
+                best[phase] = min(duration, best.get(phase, duration))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    results = {
+        "label": args.label,
+        "python": platform.python_version(),
+        "parameters": {
+            "packages": args.packages,
+            "shape": args.shape,
+            "description_size": args.description_size,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "max_paths": args.max_paths,
+        },
+        "packages_checked": checked,
+        "phases": best,
+    }
+    print(
+        "{} packages ({} shape, {} checked), best of {}".format(
+            args.packages, args.shape, checked, args.repeat
+        )
+    )
+    for phase in PHASES:
+        if phase in best:
+            print("  {:<10} {:8.2f} ms".format(phase, best[phase] * 1000))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Compare the combined regex matcher with the two separate regexes
+
+Usage: python benchmarks/regex_matcher.py [--rules N] [--licenses N] [--repeat N]
+"""
+import argparse
+import random
+import timeit
+
+from liccheck.command_line import Strategy
+from liccheck.matcher import classify_with_regex
+
+WORDS = [
+    "apache", "bsd", "mit", "gpl", "lgpl", "agpl", "mpl", "isc", "zpl", "epl",
+    "license", "software", "public", "general", "lesser", "new", "simplified",
+    "version", "or", "later", "only", "with", "exceptions", "foundation",
+]
+
+
+def make_rules(rng, count, regex_ratio=0.1):
+    rules = set()
+    while len(rules) < count:
+        rule = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        if rng.random() < regex_ratio:
+            rule = r"\b" + rule.replace(" ", r"\s+")
+        rules.add(rule)
+    return sorted(rules)
+
+
+def make_licenses(rng, count):
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--licenses", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    strategy = Strategy(
+        authorized_licenses=make_rules(rng, args.rules),
+        unauthorized_licenses=make_rules(rng, args.rules),
+        authorized_packages={},
+    )
+    licenses = make_licenses(rng, args.licenses)
+
+    def two_regexes():
+        for license in licenses:
+            (
+                strategy.AUTHORIZED_REGEX.search(license) is not None,
+                strategy.UNAUTHORIZED_REGEX.search(license) is not None,
+            )
+
+    def combined_regex():
+        for license in licenses:
+            classify_with_regex(strategy.COMBINED_REGEX, license)
+
+    print(
+        "{} rules per list, {} licenses, best of {}".format(
+            args.rules, args.licenses, args.repeat
+        )
+    )
+    for name, func in (("two regexes", two_regexes), ("combined", combined_regex)):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print("  {:<12} {:8.2f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
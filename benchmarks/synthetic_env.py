@@ -0,0 +1,159 @@
+"""Generate a synthetic site-packages directory, requirements file and strategy
+
+Usage: python benchmarks/synthetic_env.py DIRECTORY [--packages N] [--shape SHAPE]
+           [--description-size BYTES] [--seed N]
+
+The generated environment can be checked without being installed:
+
+    liccheck -s DIRECTORY/strategy.ini -r DIRECTORY/requirements.txt \\
+        --path DIRECTORY/site-packages
+"""
+import argparse
+import os
+import random
+
+# (license, weight), each written either as a License header or as a
+# classifier, like real distributions do
+LICENSES = [
+    ("MIT", 30),
+    ("BSD", 15),
+    ("Apache Software", 15),
+    ("Apache-2.0", 10),
+    ("MIT OR Apache-2.0", 8),
+    ("Python Software Foundation", 5),
+    ("GPL v3", 4),
+    ("GNU Lesser General Public License v3 (LGPLv3)", 4),
+    ("Mozilla Public License 2.0 (MPL 2.0)", 3),
+    ("Proprietary", 3),
+    ("", 3),
+]
+
+STRATEGY = """\
+[Licenses]
+authorized_licenses:
+    mit
+    bsd
+    apache software
+    apache-2.0
+    python software foundation
+    mpl 2.0
+unauthorized_licenses:
+    gpl v3
+    proprietary
+"""
+
+SHAPES = ("flat", "tree", "diamond", "random")
+
+
+def package_name(index):
+    return "pkg-{:05d}".format(index)
+
+
+def make_graph(shape, count, rng, width=4):
+    """Return the dependencies of each package by index, and the root indexes
+
+    - flat: no dependencies, every package is a root
+    - tree: binary tree, package 0 being the root
+    - diamond: layers of ``width`` packages, each one depending on two
+      packages of the next layer, so that the number of dependency paths
+      doubles at each layer
+    - random: each package depends on up to 3 packages with a higher index
+    """
+    dependencies = [[] for _ in range(count)]
+    if shape == "flat":
+        return dependencies, list(range(count))
+    if shape == "tree":
+        for i in range(count):
+            dependencies[i] = [c for c in (2 * i + 1, 2 * i + 2) if c < count]
+        return dependencies, [0]
+    if shape == "diamond":
+        for i in range(count - width):
+            layer_start = (i // width + 1) * width
+            column = i % width
+            dependencies[i] = sorted(
+                {
+                    min(layer_start + column, count - 1),
+                    min(layer_start + (column + 1) % width, count - 1),
+                }
+            )
+        return dependencies, list(range(min(width, count)))
+    if shape == "random":
+        for i in range(count - 1):
+            dependencies[i] = sorted(
+                rng.sample(range(i + 1, count), min(rng.randint(0, 3), count - i - 1))
+            )
+        required = {d for deps in dependencies for d in deps}
+        return dependencies, [i for i in range(count) if i not in required]
+    raise ValueError("Unknown shape {!r}".format(shape))
+
+
+def write_metadata(dist_info, name, version, license, requires, description_size, rng):
+    os.makedirs(dist_info)
+    lines = [
+        "Metadata-Version: 2.1",
+        "Name: {}".format(name),
+        "Version: {}".format(version),
+        "Summary: Synthetic distribution {}".format(name),
+    ]
+    if license and rng.random() < 0.5:
+        lines.append("License: {}".format(license))
+    elif license and " OR " not in license:
+        lines.append("Classifier: License :: OSI Approved :: {} License".format(license))
+    lines.append("Classifier: Programming Language :: Python :: 3")
+    lines.extend("Requires-Dist: {}".format(r) for r in requires)
+    lines.append("")
+    lines.append(("Lorem ipsum dolor sit amet. " * (description_size // 28 + 1))[:description_size])
+    with open(os.path.join(dist_info, "METADATA"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+    with open(os.path.join(dist_info, "RECORD"), "w") as f:
+        f.write("")
+
+
+def generate(directory, packages=1000, shape="random", description_size=2000, seed=42):
+    """Write DIRECTORY/site-packages, DIRECTORY/requirements.txt and
+    DIRECTORY/strategy.ini, and return their paths"""
+    rng = random.Random(seed)
+    site_packages = os.path.join(directory, "site-packages")
+    licenses, weights = zip(*LICENSES)
+    dependencies, roots = make_graph(shape, packages, rng)
+    for i in range(packages):
+        name = package_name(i)
+        version = "1.{}.0".format(i % 10)
+        write_metadata(
+            os.path.join(site_packages, "{}-{}.dist-info".format(name.replace("-", "_"), version)),
+            name,
+            version,
+            rng.choices(licenses, weights)[0],
+            [package_name(d) for d in dependencies[i]],
+            description_size,
+            rng,
+        )
+    requirements = os.path.join(directory, "requirements.txt")
+    with open(requirements, "w") as f:
+        f.write("".join(package_name(i) + "\n" for i in roots))
+    strategy = os.path.join(directory, "strategy.ini")
+    with open(strategy, "w") as f:
+        f.write(STRATEGY)
+    return site_packages, requirements, strategy
+
+
+def add_arguments(parser):
+    parser.add_argument("--packages", type=int, default=1000)
+    parser.add_argument("--shape", choices=SHAPES, default="random")
+    parser.add_argument("--description-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    add_arguments(parser)
+    args = parser.parse_args()
+    for path in generate(
+        args.directory, args.packages, args.shape, args.description_size, args.seed
+    ):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+__all__ = ["Checker", "CheckResult", "PackageResult"]
+
+
+def __getattr__(name):
+    # imported lazily, so that running the command line doesn't import the API
+    if name in __all__:
+        from liccheck import checker
+
+        return getattr(checker, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
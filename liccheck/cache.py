@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from liccheck.metadata import (
+    METADATA_VERSION,
+    is_pkg_resources_distribution,
+    metadata_file,
+)
+from liccheck.requirements import normalize_name, parse_metadata_dirname
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def default_cache_dir():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "liccheck")
+
+
+def _distribution_name_version(dist):
+    if is_pkg_resources_distribution(dist):
+        return dist.project_name, dist.version
+    name, version = parse_metadata_dirname(dist)
+    return name or "", version or ""
+
+
+def distribution_key(dist):
+    """Return a key identifying the installed metadata of a distribution
+
+    None is returned if the metadata isn't stored in a file.
+    """
+    path = metadata_file(dist)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    name, version = _distribution_name_version(dist)
+    return "|".join(
+        [
+            normalize_name(name),
+            version,
+            os.path.abspath(path),
+            str(stat.st_mtime_ns),
+            str(stat.st_size),
+        ]
+    )
+
+
+def write_json_atomically(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_json(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class MetadataCache(object):
+    """Persistent cache of the package information read from distributions
+
+    Entries are keyed by the distribution name and version along with the
+    path, modification time and size of its metadata file, so that any
+    reinstallation invalidates them, and the file name holds METADATA_VERSION
+    so that upgrading liccheck does too.  The cache is written atomically and
+    bounded to max_entries, the least recently used entries being evicted.
+    """
+
+    FILENAME = "metadata-v{}.json".format(METADATA_VERSION)
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES, refresh=False):
+        self.directory = os.path.expanduser(directory)
+        self.path = os.path.join(self.directory, self.FILENAME)
+        self.max_entries = max_entries
+        self.entries = {} if refresh else read_json(self.path)
+        self.dirty = refresh
+        self.hits = 0
+        self.misses = 0
+        # get_packages_info may read distributions from several threads
+        self.lock = threading.Lock()
+
+    def key(self, dist):
+        """Return the cache key of a distribution, None if it can't be cached"""
+        return distribution_key(dist)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["used"] = time.time()
+            self.dirty = True
+            return dict(entry["package"])
+
+    def put(self, key, package):
+        with self.lock:
+            self.entries[key] = {"package": dict(package), "used": time.time()}
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        if len(self.entries) > self.max_entries:
+            recent = sorted(
+                self.entries.items(), key=lambda item: item[1]["used"], reverse=True
+            )
+            self.entries = dict(recent[: self.max_entries])
+        write_json_atomically(self.path, self.entries)
+        self.dirty = False
+
+
+class MemoryCache(object):
+    """In-memory counterpart of MetadataCache, for long running processes
+
+    Entries have the same keys, so that the metadata of a distribution is
+    read again only when it is reinstalled.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def key(self, dist):
+        return distribution_key(dist)
+
+    def get(self, key):
+        with self.lock:
+            package = self.entries.get(key)
+            if package is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(package)
+
+    def put(self, key, package):
+        with self.lock:
+            self.entries[key] = dict(package)
+
+    def save(self):
+        pass
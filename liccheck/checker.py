@@ -0,0 +1,189 @@
+"""Checking of licenses from a long running process
+
+    from liccheck import Checker
+
+    checker = Checker.from_strategy_file("liccheck.ini")
+    result = checker.check_requirements("requirements.txt")
+    if not result.passed:
+        for package in result.failed:
+            print(package.package.name, package.reason.value, package.roots)
+
+A Checker keeps the strategy, the distribution index and the metadata read
+from distributions between checks, and can be shared between threads.
+"""
+import collections
+import os.path
+import threading
+
+from liccheck.command_line import (
+    Level,
+    Reason,
+    Strategy,
+    build_reverse_dependencies,
+    check_package,
+    get_matched_rule,
+    get_packages_info,
+    read_package_info,
+)
+from liccheck.config import PyprojectConfig
+from liccheck.package_info import PackageInfo
+from liccheck.reporting import DependencyRoots
+from liccheck.requirements import DEFAULT_BACKEND, IMPORTLIB, DistributionIndex
+
+PackageResult = collections.namedtuple(
+    "PackageResult", ["package", "reason", "rule", "roots"]
+)
+
+
+class CheckResult(collections.namedtuple("CheckResult", ["source", "packages"])):
+    """The PackageResults of a check, sorted by package name"""
+
+    __slots__ = ()
+
+    @property
+    def passed(self):
+        return all(result.reason is Reason.OK for result in self.packages)
+
+    @property
+    def failed(self):
+        return [result for result in self.packages if result.reason is not Reason.OK]
+
+    def by_reason(self, reason):
+        return [result for result in self.packages if result.reason is reason]
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "passed": self.passed,
+            "packages": [
+                {
+                    "name": result.package.name,
+                    "version": result.package.version,
+                    "licenses": list(result.package.licenses),
+                    "status": result.reason.value,
+                    "rule": result.rule,
+                    "roots": result.roots,
+                }
+                for result in self.packages
+            ],
+        }
+
+
+class Checker(object):
+    """Check requirement files or distributions against a strategy
+
+    Installed distributions are scanned on the first check only, and the
+    metadata and verdict of each distribution are kept, so that successive
+    checks only read what they didn't see before.  Call invalidate() when
+    the installed distributions change.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        level=Level.STANDARD,
+        as_regex=False,
+        no_deps=False,
+        backend=DEFAULT_BACKEND,
+        paths=None,
+        cache=None,
+        jobs=1,
+    ):
+        self.strategy = strategy
+        self.level = Level.starting(level) if isinstance(level, str) else level
+        self.as_regex = as_regex
+        self.no_deps = no_deps
+        self.backend = IMPORTLIB if paths else backend
+        self.paths = paths
+        self.cache = cache
+        self.jobs = jobs
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    @classmethod
+    def from_strategy_file(cls, strategy_file="liccheck.ini", config=None, **options):
+        """Return a Checker using the strategy of the [tool.liccheck] section of
+        pyproject.toml, or else of a strategy file"""
+        if config is None:
+            config = PyprojectConfig.load()
+        if config.liccheck is not None:
+            strategy = Strategy.from_pyproject_toml(config)
+        elif os.path.isfile(strategy_file):
+            strategy = Strategy.from_config(strategy_file)
+        else:
+            raise FileNotFoundError(strategy_file)
+        return cls(strategy, **options)
+
+    def invalidate(self):
+        """Forget the installed distributions, their metadata and verdicts"""
+        index = None
+        if self.backend == IMPORTLIB:
+            index = DistributionIndex(self.paths)
+        with self.lock:
+            # replaced at once, so that running checks keep a consistent state
+            self._state = (index, {}, {})
+
+    def _get_state(self):
+        with self.lock:
+            index, memo, verdicts = self._state
+            if index is not None:
+                # build the index once, instead of in each concurrent check
+                index.distributions
+            return index, memo, verdicts
+
+    def check_requirements(self, requirement_file):
+        """Check the packages of a requirement or lock file"""
+        index, memo, verdicts = self._get_state()
+        packages = get_packages_info(
+            requirement_file,
+            self.no_deps,
+            self.backend,
+            self.cache,
+            self.jobs,
+            index=index,
+            memo=memo,
+        )
+        return self._check(requirement_file, packages, verdicts)
+
+    def check_distributions(self, distributions, source=None):
+        """Check distributions, without resolving their dependencies
+
+        Distributions are importlib.metadata or pkg_resources distributions,
+        or PackageInfo and dicts describing packages.
+        """
+        _, memo, verdicts = self._get_state()
+        packages = {}
+        for dist in distributions:
+            if isinstance(dist, (PackageInfo, dict)):
+                package = PackageInfo.coerce(dist)
+            else:
+                package = read_package_info(dist, self.cache, memo)
+            packages.setdefault(package.key, package)
+        packages = sorted(packages.values(), key=lambda package: package.name.lower())
+        return self._check(source, packages, verdicts)
+
+    def _check(self, source, packages, verdicts):
+        roots = None
+        if not self.no_deps:
+            roots = DependencyRoots(build_reverse_dependencies(packages))
+        results = []
+        for package in packages:
+            verdict = verdicts.get(package.key)
+            if verdict is None:
+                reason = check_package(
+                    self.strategy, package, self.level, self.as_regex
+                )
+                rule = get_matched_rule(
+                    self.strategy, package, reason, self.level, self.as_regex
+                )
+                verdict = verdicts.setdefault(package.key, (reason, rule))
+            reason, rule = verdict
+            results.append(
+                PackageResult(
+                    package,
+                    reason,
+                    rule,
+                    [] if roots is None else roots.get(package.name),
+                )
+            )
+        return CheckResult(source, results)
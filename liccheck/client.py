@@ -0,0 +1,113 @@
+"""Thin client of the liccheck --serve daemon
+
+Only the standard library is imported, so that a check answered from the
+daemon's memory doesn't pay for importing liccheck itself.
+
+Usage: liccheck-client [-r REQUIREMENTS]... [--socket PATH]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+
+def default_socket_path():
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(directory, "liccheck-{}.sock".format(uid))
+
+
+class ServerError(Exception):
+    pass
+
+
+def request(message, socket_path=None, timeout=60):
+    """Send a request to the daemon and return its response"""
+    # liccheck imports this module for default_socket_path() only
+    import socket
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path or default_socket_path())
+        client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with client.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        client.close()
+    if not line:
+        raise ServerError("no response from the liccheck daemon")
+    response = json.loads(line.decode("utf-8"))
+    if "error" in response:
+        raise ServerError(response["error"])
+    return response
+
+
+def check(requirement_file, socket_path=None, timeout=60):
+    """Return the check result of a requirement file, as a dict"""
+    return request(
+        {"command": "check", "requirement_file": os.path.abspath(requirement_file)},
+        socket_path,
+        timeout,
+    )
+
+
+def write_result(result):
+    packages = result["packages"]
+    failed = [p for p in packages if p["status"] != "OK"]
+    print(
+        "{}: {} package{} checked, {}.".format(
+            result["source"],
+            len(packages),
+            "" if len(packages) <= 1 else "s",
+            "passed" if not failed else "{} failed".format(len(failed)),
+        )
+    )
+    for package in failed:
+        print(
+            "    {} ({}): {} {}".format(
+                package["name"],
+                package["version"],
+                package["licenses"] or "UNKNOWN",
+                package["status"],
+            )
+        )
+        for root in package["roots"]:
+            if root != package["name"]:
+                print("        required by {}".format(root))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check requirement files with a running liccheck --serve daemon."
+    )
+    parser.add_argument(
+        "-r",
+        "--rfile",
+        dest="requirement_files",
+        help="path/to/requirement.txt file, can be repeated",
+        action="append",
+    )
+    parser.add_argument(
+        "--socket",
+        dest="socket_path",
+        help="socket of the daemon (default: {})".format(default_socket_path()),
+        default=None,
+    )
+    args = parser.parse_args()
+    ret = 0
+    for requirement_file in args.requirement_files or ["./requirements.txt"]:
+        try:
+            result = check(requirement_file, args.socket_path)
+        except (OSError, ServerError) as e:
+            print("liccheck daemon: {}".format(e), file=sys.stderr)
+            return 2
+        write_result(result)
+        if not result["passed"]:
+            ret = 1
+    return ret
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,107 @@
 import argparse
 import collections
+import collections.abc
+import contextlib
+import glob
 import os.path
 
-from liccheck.requirements import parse_requirements, resolve, resolve_without_deps
+from liccheck.cache import MetadataCache, default_cache_dir
+from liccheck.client import default_socket_path
+from liccheck.config import PyprojectConfig, thaw
+from liccheck.incremental import (
+    DEFAULT_STATE_FILE,
+    IncrementalState,
+    strategy_fingerprint,
+)
+from liccheck.matcher import classify_with_regex, compile_combined_regex
+from liccheck.lockfile import read_lockfile
+from liccheck.metadata import read_distribution
+from liccheck.package_info import PackageInfo
+from liccheck.stats import NULL_STATS, Stats
+from liccheck import reporting, spdx
+from liccheck.requirements import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    IMPORTLIB,
+    DistributionIndex,
+    get_version,
+    normalize_name,
+    parse_requirements,
+    resolve,
+    resolve_without_deps,
+)
 
 from configparser import ConfigParser, NoOptionError
 import enum
 import functools
+import itertools
+import json
 import re
 import textwrap
 import sys
-import semantic_version
-import toml
-
-try:
-    FileNotFoundError
-except NameError:
-    FileNotFoundError = IOError
+import time
 
 
 class NoValidConfigurationInPyprojectToml(BaseException):
     pass
 
 
-def from_pyproject_toml():
-    try:
-        pyproject_toml = toml.load("pyproject.toml")
-        try:
-            return pyproject_toml["tool"]["liccheck"]
-        except KeyError:
-            raise NoValidConfigurationInPyprojectToml
-    except FileNotFoundError:
+def from_pyproject_toml(config=None):
+    """Return the [tool.liccheck] section of the configuration
+
+    The pyproject.toml file of the current directory is loaded if no
+    PyprojectConfig is given.
+    """
+    if config is None:
+        config = PyprojectConfig.load()
+    if config.liccheck is None:
         raise NoValidConfigurationInPyprojectToml
+    return config.liccheck
+
+
+class InvalidAuthorizedPackages(ValueError):
+    pass
+
+
+def parse_authorized_packages(authorized_packages):
+    """Return the version specifiers of the authorized packages by normalized name
+
+    Authorized packages are either a mapping of names to specifiers, or a list
+    of "name: specifier" strings.  An empty specifier is returned as None: any
+    version is then authorized at the standard level.
+    """
+    if isinstance(authorized_packages, collections.abc.Mapping):
+        items = authorized_packages.items()
+    else:
+        items = [str(item).partition(":")[::2] for item in authorized_packages]
+    specs = {}
+    errors = []
+    for name, value in items:
+        value = str(value).strip()
+        try:
+            spec = _simple_spec(value) if value else None
+        except ValueError:
+            errors.append("{}: {!r}".format(name.strip(), value))
+            continue
+        specs[normalize_name(name.strip())] = spec
+    if errors:
+        raise InvalidAuthorizedPackages(
+            "Invalid version specifiers for authorized packages: {}".format(
+                ", ".join(errors)
+            )
+        )
+    return specs
+
+
+def _spdx_ids(licenses):
+    return frozenset(spdx.normalize_license(license) for license in licenses) - {None}
+
+
+def _simple_spec(value):
+    # semantic_version is only needed by versioned authorized packages
+    import semantic_version
+
+    return semantic_version.SimpleSpec(value)
 
 
 class Strategy:
@@ -66,9 +136,103 @@ class Strategy:
             )
         )
 
+        self.AUTHORIZED_SPECS = parse_authorized_packages(self.AUTHORIZED_PACKAGES)
+
+        self.COMBINED_REGEX = compile_combined_regex(
+            self.AUTHORIZED_LICENSES, self.UNAUTHORIZED_LICENSES
+        )
+
+        self._authorized_set = frozenset(self.AUTHORIZED_LICENSES)
+        self._unauthorized_set = frozenset(self.UNAUTHORIZED_LICENSES)
+        self._authorized_ids = _spdx_ids(self.AUTHORIZED_LICENSES)
+        self._unauthorized_ids = _spdx_ids(self.UNAUTHORIZED_LICENSES)
+        # (license, as_regex) -> (authorized, unauthorized)
+        self._classifications = {}
+        # (license, authorized, as_regex) -> first matching rule
+        self._matching_rules = {}
+        # authorized -> [(rule, compiled rule)], compiled on first use
+        self._rule_patterns = {}
+        # license_classifications: licenses classified, not from the memo
+        # regex_evaluations: regular expression searches of licenses
+        self.counters = collections.Counter()
+
+    def classify(self, license_str, as_regex=False):
+        """Return whether a license is (authorized, unauthorized)
+
+        Without regular expressions, licenses also match when they are known
+        spellings of the same SPDX identifier, e.g. "apache software license"
+        and "apache-2.0".  Classifications are memoized, as most packages share
+        a handful of licenses.
+        """
+        try:
+            return self._classifications[license_str, as_regex]
+        except KeyError:
+            pass
+        self.counters["license_classifications"] += 1
+        if as_regex and self.COMBINED_REGEX is not None:
+            self.counters["regex_evaluations"] += 1
+            classification = classify_with_regex(self.COMBINED_REGEX, license_str)
+        elif as_regex:
+            self.counters["regex_evaluations"] += 2
+            classification = (
+                self.AUTHORIZED_REGEX.search(license_str) is not None,
+                self.UNAUTHORIZED_REGEX.search(license_str) is not None,
+            )
+        else:
+            spdx_id = spdx.normalize_license(license_str)
+            classification = (
+                license_str in self._authorized_set or spdx_id in self._authorized_ids,
+                license_str in self._unauthorized_set
+                or spdx_id in self._unauthorized_ids,
+            )
+        self._classifications[license_str, as_regex] = classification
+        return classification
+
+    def matching_rule(self, license_str, authorized=True, as_regex=False):
+        """Return the first authorized (or unauthorized) rule matching a license
+
+        Rules are memoized like classifications, and regular expression rules
+        compiled once.
+        """
+        key = (license_str, authorized, as_regex)
+        try:
+            return self._matching_rules[key]
+        except KeyError:
+            pass
+        rule = self._find_matching_rule(license_str, authorized, as_regex)
+        self._matching_rules[key] = rule
+        return rule
+
+    def _rule_patterns_of(self, authorized):
+        try:
+            return self._rule_patterns[authorized]
+        except KeyError:
+            pass
+        rules = self.AUTHORIZED_LICENSES if authorized else self.UNAUTHORIZED_LICENSES
+        patterns = [(rule, re.compile(rule)) for rule in rules]
+        self._rule_patterns[authorized] = patterns
+        return patterns
+
+    def _find_matching_rule(self, license_str, authorized, as_regex):
+        if as_regex:
+            for rule, pattern in self._rule_patterns_of(authorized):
+                self.counters["regex_evaluations"] += 1
+                if pattern.search(license_str):
+                    return rule
+            return None
+        rules = self.AUTHORIZED_LICENSES if authorized else self.UNAUTHORIZED_LICENSES
+        if license_str in rules:
+            return license_str
+        spdx_id = spdx.normalize_license(license_str)
+        if spdx_id is not None:
+            for rule in rules:
+                if spdx.normalize_license(rule) == spdx_id:
+                    return rule
+        return None
+
     @classmethod
-    def from_pyproject_toml(cls):
-        liccheck_section = from_pyproject_toml()
+    def from_pyproject_toml(cls, config=None):
+        liccheck_section = from_pyproject_toml(config)
 
         def elements_to_lower_str(lst):
             return [str(_).lower() for _ in lst]
@@ -80,7 +244,7 @@ class Strategy:
             unauthorized_licenses=elements_to_lower_str(
                 liccheck_section.get("unauthorized_licenses", [])
             ),
-            authorized_packages=liccheck_section.get("authorized_packages", dict()),
+            authorized_packages=thaw(liccheck_section.get("authorized_packages", {})),
         )
         return strategy
 
@@ -108,9 +272,6 @@ class Strategy:
             unauthorized_licenses=get_config_list("Licenses", "unauthorized_licenses"),
             authorized_packages=authorized_packages,
         )
-        if config.has_section("Authorized Packages"):
-            for name, value in config.items("Authorized Packages"):
-                strategy.AUTHORIZED_PACKAGES[name] = value
         return strategy
 
 
@@ -137,102 +298,175 @@ class Reason(enum.Enum):
     UNKNOWN = "UNKNOWN"
 
 
-def get_packages_info(requirement_file, no_deps=False):
-    regex_license = re.compile(r"License(?:-Expression)?: (?P<license>.*)?$", re.M)
-    regex_classifier = re.compile(
-        r"Classifier: License(?: :: OSI Approved)?(?: :: (?P<classifier>.*))?$", re.M
-    )
-
-    requirements = parse_requirements(requirement_file)
+def get_packages_info(
+    requirement_file,
+    no_deps=False,
+    backend=DEFAULT_BACKEND,
+    cache=None,
+    jobs=1,
+    index=None,
+    memo=None,
+    stats=None,
+):
+    """Return the packages required by a requirement file, sorted by name
+
+    index and memo can be shared by successive calls to only scan the
+    installed distributions once, and read the metadata of a distribution
+    once, memo mapping distributions to their PackageInfo.  Within a call,
+    the metadata read to resolve the dependencies is kept in memo and
+    reused for the licenses.
+
+    The requirement file can also be a lock file (see liccheck.lockfile), in
+    which case all its packages are returned, with the locked dependencies.
+    Locked packages which aren't installed have no license.
+    """
+    stats = stats or NULL_STATS
+    with stats.timer("parse"):
+        locked = read_lockfile(requirement_file)
+        if locked is None:
+            requirements = parse_requirements(requirement_file)
+
+    if memo is None:
+        memo = {}
 
     def transform(dist):
-        licenses = get_license(dist) or get_licenses_from_classifiers(dist) or []
-        # Removing Trailing windows generated \r
-        licenses = list(set([strip_license_for_windows(l) for l in licenses]))
-        # Strip the useless "License" suffix and uniquify
-        licenses = list(set([strip_license(l) for l in licenses]))
-
-        return {
-            "name": dist.project_name,
-            "version": dist.version,
-            "location": dist.location,
-            "dependencies": [dependency.project_name for dependency in dist.requires()],
-            "licenses": licenses,
-        }
-
-    def get_license(dist):
-        if dist.has_metadata(dist.PKG_INFO):
-            metadata = dist.get_metadata(dist.PKG_INFO)
-            match = regex_license.search(metadata)
-            if match:
-                license = match.group("license")
-                if license != "UNKNOWN":  # Value when license not specified.
-                    return [license]
-
-        return []
-
-    def get_licenses_from_classifiers(dist):
-        if dist.has_metadata(dist.PKG_INFO):
-            metadata = dist.get_metadata(dist.PKG_INFO)
-
-            # match might be found, but None if using the classifier:
-            # License :: OSI Approved
-            return [m for m in regex_classifier.findall(metadata) if m]
-
-        return []
-
-    def strip_license_for_windows(license):
-        if license.endswith("\r"):
-            return license[:-1]
-        return license
-
-    def strip_license(license):
-        if license.lower().endswith(" license"):
-            return license[: -len(" license")]
-        return license
-
-    resolve_func = resolve_without_deps if no_deps else resolve
-    packages = [transform(dist) for dist in resolve_func(requirements)]
+        if dist is None:
+            return None
+        return read_package_info(dist, cache, memo, stats)
+
+    if index is None and (locked is not None or backend == IMPORTLIB):
+        index = DistributionIndex()
+    with stats.timer("resolve"):
+        if locked is not None:
+            dists = [find_locked_distribution(index, package) for package in locked]
+        elif no_deps:
+            dists = list(
+                resolve_without_deps(requirements, backend=backend, index=index)
+            )
+        else:
+            dists = list(
+                resolve(
+                    requirements,
+                    backend=backend,
+                    index=index,
+                    requires_dist=lambda dist: transform(dist).requires_dist,
+                )
+            )
+    if index is not None:
+        stats.set("distributions_scanned", len(index))
+    with stats.timer("metadata"):
+        if jobs > 1:
+            import concurrent.futures
+
+            # reading metadata is I/O bound, map keeps the resolution order
+            with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+                packages = list(executor.map(transform, dists))
+        else:
+            packages = [transform(dist) for dist in dists]
+    if locked is not None:
+        packages = [
+            locked_package_info(package, installed)
+            for package, installed in zip(locked, packages)
+        ]
     # keep only unique values as there are maybe some duplicates
-    unique = []
-    [unique.append(item) for item in packages if item not in unique]
+    unique = {}
+    for package in packages:
+        unique.setdefault(package.key, package)
+
+    return sorted(unique.values(), key=(lambda item: item.name.lower()))
+
+
+def strip_license(license):
+    """Strip the useless "License" suffix of a license name"""
+    if license.lower().endswith(" license"):
+        return license[: -len(" license")]
+    return license
+
+
+def read_package_info(dist, cache=None, memo=None, stats=None):
+    """Return the PackageInfo of a distribution
+
+    The metadata are read from memo (a dict of PackageInfo by distribution)
+    or the metadata cache when possible.  The Requires-Dist is cached along
+    with the package, so that resolving the dependencies of a cached
+    distribution doesn't read its metadata either.
+    """
+    if memo is not None:
+        package = memo.get(dist)
+        if package is None:
+            package = memo.setdefault(dist, read_package_info(dist, cache, None, stats))
+        return package
+    stats = stats or NULL_STATS
+    key = cache.key(dist) if cache is not None else None
+    if key is not None:
+        package = cache.get(key)
+        if package is not None:
+            return PackageInfo.from_dict(package)
+    start = time.perf_counter()
+    package = read_distribution(dist)
+    stats.record_distribution(package["name"], time.perf_counter() - start)
+    stats.count("metadata_reads")
+    stats.count("metadata_bytes_read", package.get("metadata_bytes", 0))
+    # PackageInfo uniquifies the stripped licenses
+    package["licenses"] = [strip_license(l) for l in package["licenses"]]
+    package = PackageInfo.from_dict(package)
+    if key is not None:
+        cache.put(key, dict(package.to_dict(), requires_dist=package.requires_dist))
+    return package
+
+
+def find_locked_distribution(index, package):
+    """Return the installed distribution of a locked package, if the versions match"""
+    from packaging.version import InvalidVersion, Version
+
+    dist = index.get(package.name)
+    if dist is None:
+        return None
+    try:
+        matches = Version(get_version(dist)) == Version(package.version)
+    except InvalidVersion:
+        matches = get_version(dist) == package.version
+    return dist if matches else None
+
+
+def locked_package_info(package, installed=None):
+    """Return the PackageInfo of a locked package, with the licenses of the
+    installed distribution if any"""
+    return PackageInfo(
+        package.name,
+        package.version,
+        installed.location if installed is not None else None,
+        package.dependencies,
+        installed.licenses if installed is not None else (),
+    )
+
 
-    return sorted(unique, key=(lambda item: item["name"].lower()))
+def is_authorized_package(strategy, pkg, level=Level.STANDARD):
+    """Return whether a package is authorized whatever its licenses"""
+    name = pkg.key[0]
+    if name not in strategy.AUTHORIZED_SPECS:
+        return False
+    spec = strategy.AUTHORIZED_SPECS[name]
+    if spec is None:
+        return level == Level.STANDARD
+    version = pkg.parsed_version
+    return version is not None and spec.match(version)
 
 
 def check_package(strategy, pkg, level=Level.STANDARD, as_regex=False):
-    whitelisted = pkg["name"] in strategy.AUTHORIZED_PACKAGES and (
-        semantic_version.SimpleSpec(strategy.AUTHORIZED_PACKAGES[pkg["name"]]).match(
-            semantic_version.Version.coerce(pkg["version"])
-        )
-        or (level == Level.STANDARD and strategy.AUTHORIZED_PACKAGES[pkg["name"]] == "")
-    )
-    if whitelisted:
+    pkg = PackageInfo.coerce(pkg)
+    if is_authorized_package(strategy, pkg, level):
         return Reason.OK
 
-    def check_one(license_str, license_rule="AUTHORIZED", as_regex=False):
-        if as_regex:
-            license_regex = getattr(strategy, "{}_REGEX".format(license_rule))
-            return license_regex.search(license_str) is not None
-        else:
-            license_list = getattr(strategy, "{}_LICENSES".format(license_rule))
-            return license_str in license_list
-
     at_least_one_unauthorized = False
     count_authorized = 0
-    licenses = get_license_names(pkg["licenses"])
-    for license in licenses:
-        if check_one(
-            license,
-            license_rule="UNAUTHORIZED",
-            as_regex=as_regex,
-        ):
+    classify = functools.partial(strategy.classify, as_regex=as_regex)
+    licenses = get_license_options(pkg.licenses)
+    for option in licenses:
+        authorized, unauthorized = spdx.classify_option(option, classify)
+        if unauthorized:
             at_least_one_unauthorized = True
-        if check_one(
-            license,
-            license_rule="AUTHORIZED",
-            as_regex=as_regex,
-        ):
+        if authorized:
             count_authorized += 1
 
     if (
@@ -256,53 +490,186 @@ def check_package(strategy, pkg, level=Level.STANDARD, as_regex=False):
 
     return Reason.UNKNOWN
 
-def get_license_names(licenses):
-    names = []
-    for license in licenses:
-        options = license.split(" OR ")
-        for option in options:
-            names.append(option.lower())
-    return names
-
-def find_parents(package, all, seen):
-    if package in seen:
-        return [package]
-    seen.add(package)
-    parents = [p["name"] for p in all if package in p["dependencies"]]
-    if len(parents) == 0:
-        return [package]
-    dependency_trees = []
-    for parent in parents:
-        for dependencies in find_parents(parent, all, seen):
-            dependency_trees.append(package + " << " + dependencies)
-    return dependency_trees
-
-
-def write_package(package, all, no_deps=False):
-    licenses = sorted(package["licenses"]) or "UNKNOWN"
-    print("    {} ({}): {}".format(package["name"], package["version"], licenses))
-    if not no_deps:
-        write_deps(package, all)
 
+def get_matched_rule(strategy, pkg, reason, level=Level.STANDARD, as_regex=False):
+    """Return the strategy rule which gave a package its verdict, if any
+
+    Rules are "authorized_packages: <name>", "authorized_licenses: <rule>" or
+    "unauthorized_licenses: <rule>", the rule being the first one matching a
+    license of the package.
+    """
+    pkg = PackageInfo.coerce(pkg)
+    if reason is Reason.UNKNOWN:
+        return None
+    if reason is Reason.OK and is_authorized_package(strategy, pkg, level):
+        return "authorized_packages: {}".format(pkg.key[0])
+    authorized = reason is Reason.OK
+    for option in get_license_options(pkg.licenses):
+        for term in option:
+            names = [spdx.term_name(term)]
+            if isinstance(term, spdx.With):
+                names.append(spdx.term_name(term.license))
+            for name in names:
+                rule = strategy.matching_rule(name, authorized, as_regex)
+                if rule is not None:
+                    return "{}_licenses: {}".format(
+                        "authorized" if authorized else "unauthorized", rule
+                    )
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _license_options(license):
+    try:
+        return tuple(spdx.to_options(spdx.parse(license)))
+    except spdx.ParseError:
+        return tuple((spdx.License(name),) for name in license.split(" OR "))
+
+
+def get_license_options(licenses):
+    """Return the alternative licenses a package can be used under
 
-def write_deps(package, all):
-    dependency_branches = find_parents(package["name"], all, set())
-    print("      dependenc{}:".format("y" if len(dependency_branches) <= 1 else "ies"))
-    for dependency_branch in dependency_branches:
-        print("          {}".format(dependency_branch))
+    Each alternative is a tuple of licenses which all apply, as given by
+    SPDX expressions such as "(MIT AND Apache-2.0) OR BSD-3-Clause".
+    Licenses which aren't SPDX expressions are only split on " OR ".
+    """
+    options = []
+    for license in licenses:
+        options.extend(_license_options(license))
+    return options
 
 
-def write_packages(packages, all, no_deps=False):
+def build_reverse_dependencies(packages):
+    """Map each normalized package name to the names of the packages depending on it"""
+    reverse_dependencies = collections.defaultdict(dict)
     for package in packages:
-        write_package(package, all, no_deps)
+        package = PackageInfo.coerce(package)
+        for dependency in package.dependencies:
+            # dict keys are used as an insertion-ordered set of dependents
+            reverse_dependencies[normalize_name(dependency)][package.name] = None
+    return reverse_dependencies
+
+
+DependencyPaths = collections.namedtuple("DependencyPaths", ["paths", "elided"])
+
+
+def _iter_dependency_chains(package, reverse_dependencies, max_depth=None):
+    """Yield the dependency chains going from package up to its dependents
+
+    Chains are linked ``(name, previous)`` pairs so that all the chains going
+    through a package share the same prefix instead of copying it.  As every
+    package is expanded only once per traversal, the number of chains is
+    bounded by the number of packages.
+    """
+    seen = set()
+    stack = [((package, None), normalize_name(package), 0)]
+    while stack:
+        chain, key, depth = stack.pop()
+        if key in seen:
+            yield chain
+            continue
+        seen.add(key)
+        parents = reverse_dependencies.get(key, ())
+        if len(parents) == 0:
+            yield chain
+        elif max_depth is not None and depth >= max_depth:
+            yield ("...", chain)
+        else:
+            for parent in reversed(list(parents)):
+                stack.append(((parent, chain), normalize_name(parent), depth + 1))
+
+
+def _shortest_dependency_chain(package, reverse_dependencies):
+    """Return the shortest chain going from package to a root requirement"""
+    queue = collections.deque([((package, None), normalize_name(package))])
+    seen = set()
+    while queue:
+        chain, key = queue.popleft()
+        if key in seen:
+            continue
+        seen.add(key)
+        parents = reverse_dependencies.get(key, ())
+        if len(parents) == 0:
+            return chain
+        for parent in parents:
+            queue.append(((parent, chain), normalize_name(parent)))
+    return None
+
+
+def _chain_to_tuple(chain):
+    names = []
+    while chain is not None:
+        name, chain = chain
+        names.append(name)
+    names.reverse()
+    return tuple(names)
 
 
-def group_by(items, key):
-    res = collections.defaultdict(list)
-    for item in items:
-        res[key(item)].append(item)
+def find_dependency_paths(
+    package, reverse_dependencies, max_paths=None, max_depth=None, shortest=False
+):
+    """Return the dependency paths of package along with the number of elided ones
+
+    Paths are tuples of names starting with package and ending with a root
+    requirement (or a package already visited, when dependencies are cyclic).
+    Paths longer than max_depth end with "...".
+    """
+    chains = _iter_dependency_chains(package, reverse_dependencies, max_depth)
+    if shortest:
+        first = _shortest_dependency_chain(package, reverse_dependencies)
+        if first is None:
+            # only required from a dependency cycle: the first chain is displayed
+            first = next(chains)
+        else:
+            # the shortest chain is one of the chains, which isn't elided
+            next(chains)
+        return DependencyPaths([_chain_to_tuple(first)], sum(1 for _ in chains))
+    if max_paths is None:
+        return DependencyPaths([_chain_to_tuple(chain) for chain in chains], 0)
+    paths = [_chain_to_tuple(chain) for chain in itertools.islice(chains, max_paths)]
+    return DependencyPaths(paths, sum(1 for _ in chains))
+
+
+def find_parents(package, reverse_dependencies):
+    paths, _ = find_dependency_paths(package, reverse_dependencies)
+    return [" << ".join(path) for path in paths]
+
+
+def write_package(
+    package, reverse_dependencies, no_deps=False, stats=None, **path_options
+):
+    package = PackageInfo.coerce(package)
+    licenses = list(package.licenses) or "UNKNOWN"
+    print("    {} ({}): {}".format(package.name, package.version, licenses))
+    if not no_deps:
+        write_deps(package, reverse_dependencies, stats=stats, **path_options)
+
+
+def write_deps(package, reverse_dependencies, stats=None, **path_options):
+    paths, elided = find_dependency_paths(
+        package.name, reverse_dependencies, **path_options
+    )
+    (stats or NULL_STATS).count("dependency_paths", len(paths) + elided)
+    print(
+        "      dependenc{}:".format("y" if len(paths) + elided <= 1 else "ies")
+    )
+    for path in paths:
+        print("          {}".format(" << ".join(path)))
+    if elided:
+        print(
+            "          ({} more dependency path{} elided)".format(
+                elided, "" if elided == 1 else "s"
+            )
+        )
+
 
-    return res
+def write_packages(
+    packages, all, no_deps=False, reverse_dependencies=None, stats=None, **path_options
+):
+    if reverse_dependencies is None and not no_deps:
+        reverse_dependencies = build_reverse_dependencies(all)
+    for package in packages:
+        write_package(package, reverse_dependencies, no_deps, stats, **path_options)
 
 
 def process(
@@ -312,41 +679,104 @@ def process(
     reporting_file=None,
     no_deps=False,
     as_regex=False,
+    max_paths=None,
+    max_depth=None,
+    shortest_path=False,
+    backend=DEFAULT_BACKEND,
+    cache=None,
+    state=None,
+    jobs=1,
+    report_format="text",
+    index=None,
+    memo=None,
+    verdicts=None,
+    writer=None,
+    stats=None,
 ):
+    stats = stats or NULL_STATS
+    # the state is shared by the requirement files checked in a run
+    rechecked_before = 0 if state is None else state.rechecked
     print("gathering licenses...")
-    pkg_info = get_packages_info(requirement_file, no_deps)
-    all = list(pkg_info)
+    pkg_info = get_packages_info(
+        requirement_file,
+        no_deps,
+        backend,
+        cache if state is None else state,
+        jobs,
+        index=index,
+        memo=memo,
+        stats=stats,
+    )
     deps_mention = "" if no_deps else " and dependencies"
     print(
         "{} package{}{}.".format(
             len(pkg_info), "" if len(pkg_info) <= 1 else "s", deps_mention
         )
     )
-    groups = group_by(
-        pkg_info,
-        functools.partial(check_package, strategy, level=level, as_regex=as_regex),
-    )
+
+    def check(pkg):
+        # verdicts are shared by the requirement files checked in a run
+        if verdicts is not None and pkg.key in verdicts:
+            return verdicts[pkg.key]
+        verdict = None if state is None else state.verdict(pkg)
+        if verdict is None:
+            reason = check_package(strategy, pkg, level=level, as_regex=as_regex)
+        else:
+            reason = Reason(verdict)
+        if state is not None:
+            state.record(pkg, reason.value)
+        if verdicts is not None:
+            verdicts[pkg.key] = reason
+        return reason
+
     ret = 0
+    reverse_dependencies = None if no_deps else build_reverse_dependencies(pkg_info)
+    path_options = dict(
+        max_paths=max_paths, max_depth=max_depth, shortest=shortest_path
+    )
 
-    if reporting_file:
-        packages = []
-        for r, ps in groups.items():
-            for p in ps:
-                packages.append(
+    groups = collections.defaultdict(list)
+    with contextlib.ExitStack() as stack:
+        if writer is None:
+            writer = stack.enter_context(
+                reporting.open_writer(reporting_file, report_format, requirement_file)
+            )
+        else:
+            writer.source = requirement_file
+        roots = None
+        if writer is not None and not no_deps:
+            roots = reporting.DependencyRoots(reverse_dependencies)
+        for pkg in pkg_info:
+            with stats.timer("check"):
+                reason = check(pkg)
+            groups[reason].append(pkg)
+            if writer is None:
+                continue
+            with stats.timer("report"):
+                writer.write(
                     {
-                        "name": p["name"],
-                        "version": p["version"],
-                        "license": (p["licenses"] or ["UNKNOWN"])[0],
-                        "status": r,
+                        "name": pkg.name,
+                        "version": pkg.version,
+                        "licenses": list(pkg.licenses),
+                        "status": reason.value,
+                        "rule": get_matched_rule(
+                            strategy, pkg, reason, level=level, as_regex=as_regex
+                        )
+                        if writer.writes_rule
+                        else None,
+                        "roots": [] if roots is None else roots.get(pkg.name),
+                        "requirement_file": requirement_file,
                     }
                 )
-        with open(reporting_file, "w") as f:
-            for p in sorted(packages, key=lambda i: i["name"]):
-                f.write(
-                    "{} {} {} {}\n".format(
-                        p["name"], p["version"], p["license"], p["status"].value
-                    )
-                )
+    stats.count("packages_checked", len(pkg_info))
+
+    if state is not None:
+        rechecked = state.rechecked - rechecked_before
+        print(
+            "{} package{} checked since the last run.".format(
+                rechecked, "" if rechecked <= 1 else "s"
+            )
+        )
 
     def format(l):
         return "{} package{}.".format(len(l), "" if len(l) <= 1 else "s")
@@ -358,21 +788,37 @@ def process(
     if groups[Reason.UNAUTHORIZED]:
         print("check unauthorized packages...")
         print(format(groups[Reason.UNAUTHORIZED]))
-        write_packages(groups[Reason.UNAUTHORIZED], all, no_deps)
+        with stats.timer("report"):
+            write_packages(
+                groups[Reason.UNAUTHORIZED],
+                pkg_info,
+                no_deps,
+                reverse_dependencies,
+                stats,
+                **path_options
+            )
         ret = -1
 
     if groups[Reason.UNKNOWN]:
         print("check unknown packages...")
         print(format(groups[Reason.UNKNOWN]))
-        write_packages(groups[Reason.UNKNOWN], all, no_deps)
+        with stats.timer("report"):
+            write_packages(
+                groups[Reason.UNKNOWN],
+                pkg_info,
+                no_deps,
+                reverse_dependencies,
+                stats,
+                **path_options
+            )
         ret = -1
 
     return ret
 
 
-def read_strategy(strategy_file=None):
+def _read_strategy(strategy_file=None, config=None):
     try:
-        return Strategy.from_pyproject_toml()
+        return Strategy.from_pyproject_toml(config)
     except NoValidConfigurationInPyprojectToml:
         pass
     if not os.path.isfile(strategy_file):
@@ -383,6 +829,49 @@ def read_strategy(strategy_file=None):
     return Strategy.from_config(strategy_file=strategy_file)
 
 
+def read_strategy(strategy_file=None, config=None):
+    try:
+        return _read_strategy(strategy_file, config)
+    except InvalidAuthorizedPackages as e:
+        print(e)
+        sys.exit(1)
+
+
+class AppendRequirementFile(argparse.Action):
+    """Store a requirement file as a string, and several ones as a list"""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        current = getattr(namespace, self.dest, None)
+        if current is self.default or current is None:
+            setattr(namespace, self.dest, values)
+        elif isinstance(current, list):
+            current.append(values)
+        else:
+            setattr(namespace, self.dest, [current, values])
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("{} is negative".format(value))
+    return number
+
+
+def requirement_files(value):
+    """Return the requirement files of a file name, glob pattern or list of them
+
+    Patterns matching no file are kept as they are, so that they are reported
+    as missing files.
+    """
+    if isinstance(value, str):
+        value = [value]
+    files = []
+    for item in value:
+        matches = sorted(glob.glob(item)) if glob.has_magic(item) else []
+        files.extend(matches or [item])
+    return files
+
+
 def parse_args(args):
     parser = argparse.ArgumentParser(
         description="Check license of packages and their dependencies.",
@@ -414,7 +903,8 @@ def parse_args(args):
         "-r",
         "--rfile",
         dest="requirement_txt_file",
-        help="path/to/requirement.txt file",
+        help="path/to/requirement.txt file, can be repeated or be a glob pattern",
+        action=AppendRequirementFile,
         nargs="?",
         default="./requirements.txt",
     )
@@ -426,6 +916,13 @@ def parse_args(args):
         nargs="?",
         default=None,
     )
+    parser.add_argument(
+        "--format",
+        dest="report_format",
+        help="format of the reporting file (default: text)",
+        choices=reporting.FORMATS,
+        default="text",
+    )
     parser.add_argument(
         "--no-deps",
         dest="no_deps",
@@ -438,13 +935,142 @@ def parse_args(args):
         help="enable regular expression matching for licenses",
         action="store_true",
     )
+    parser.add_argument(
+        "--max-paths",
+        dest="max_paths",
+        help="maximum number of dependency paths displayed per package",
+        type=non_negative_int,
+        default=None,
+    )
+    parser.add_argument(
+        "--max-depth",
+        dest="max_depth",
+        help="maximum length of the dependency paths displayed",
+        type=non_negative_int,
+        default=None,
+    )
+    parser.add_argument(
+        "--shortest-path",
+        dest="shortest_path",
+        help="only display the shortest path to a root requirement",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--backend",
+        dest="backend",
+        help="library used to find installed distributions (default: {})".format(
+            DEFAULT_BACKEND
+        ),
+        choices=BACKENDS,
+        default=DEFAULT_BACKEND,
+    )
+    parser.add_argument(
+        "--path",
+        dest="paths",
+        help="check the distributions found in this site-packages directory,\n"
+        ".dist-info directory, wheel file or directory of wheel files instead\n"
+        "of the installed ones, can be repeated (implies --backend importlib)",
+        action="append",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        help="cache the metadata read from distributions in this directory\n"
+        "(default: {})".format(default_cache_dir()),
+        nargs="?",
+        const=default_cache_dir(),
+        default=None,
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        help="don't use the metadata cache",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        dest="refresh_cache",
+        help="ignore the cached metadata and cache it again",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        help="only check the packages which changed since the run saved in this\n"
+        "state file (default: {})".format(DEFAULT_STATE_FILE),
+        nargs="?",
+        const=DEFAULT_STATE_FILE,
+        default=None,
+    )
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        help="print the time spent in each phase, counters and the slowest\n"
+        "distributions to read",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--stats-file",
+        dest="stats_file",
+        help="write the statistics to this JSON file",
+        default=None,
+    )
+    parser.add_argument(
+        "--stats-top",
+        dest="stats_top",
+        help="number of slowest distributions in the statistics (default: 10)",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "--trace-memory",
+        dest="trace_memory",
+        help="add the peak memory usage to the statistics, using tracemalloc",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        help="profile the run with cProfile and write the profile to this file\n"
+        "(default: liccheck.prof)",
+        nargs="?",
+        const="liccheck.prof",
+        default=None,
+    )
+    parser.add_argument(
+        "--serve",
+        dest="serve",
+        help="keep the distributions and the strategy in memory and check the\n"
+        "requirement files sent to this Unix socket by liccheck-client\n"
+        "(default: {})".format(default_socket_path()),
+        nargs="?",
+        const=default_socket_path(),
+        default=None,
+    )
+    parser.add_argument(
+        "--poll-interval",
+        dest="poll_interval",
+        help="seconds between the checks for changes of the installed\n"
+        "distributions and the configuration with --serve (default: 1)",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        help="number of threads reading the metadata of distributions",
+        type=int,
+        default=1,
+    )
 
     return parser.parse_args(args)
 
 
-def merge_args(args):
+def merge_args(args, config=None):
     try:
-        config = from_pyproject_toml()
+        config = from_pyproject_toml(config)
     except NoValidConfigurationInPyprojectToml:
         return args
     return {
@@ -456,31 +1082,45 @@ def merge_args(args):
         "reporting_txt_file": config.get(
             "reporting_txt_file", args["reporting_txt_file"]
         ),
+        "report_format": config.get("report_format", args["report_format"]),
         "no_deps": config.get("no_deps", args["no_deps"]),
         "dependencies": config.get("dependencies", args["dependencies"]),
         "optional_dependencies": config.get(
             "optional_dependencies", args["optional_dependencies"]
         ),
         "as_regex": config.get("as_regex", args["as_regex"]),
+        "max_paths": config.get("max_paths", args["max_paths"]),
+        "max_depth": config.get("max_depth", args["max_depth"]),
+        "shortest_path": config.get("shortest_path", args["shortest_path"]),
+        "backend": config.get("backend", args["backend"]),
+        "paths": config.get("paths", args["paths"]),
+        "cache_dir": config.get("cache_dir", args["cache_dir"]),
+        "no_cache": args["no_cache"],
+        "refresh_cache": args["refresh_cache"],
+        "incremental": config.get("incremental", args["incremental"]),
+        "jobs": config.get("jobs", args["jobs"]),
     }
 
 
-def generate_requirements_file_from_pyproject(include_dependencies, optional_dependencies):
+def generate_requirements_file_from_pyproject(
+    include_dependencies, optional_dependencies, config=None
+):
     import tempfile
 
+    if config is None:
+        config = PyprojectConfig.load()
     directory = tempfile.mkdtemp(prefix="liccheck_")
     requirements_txt_file = directory + "/requirements.txt"
     with open(requirements_txt_file, "w") as f:
-        ptoml = toml.load("pyproject.toml")
-        project = ptoml.get("project", {})
-        poetry = ptoml.get("tool", {}).get('poetry', {})
+        project = config.project
+        poetry = config.poetry
         dependencies = set()
         if include_dependencies:
             dependencies |= set(project.get("dependencies", []))
             dependencies |= set(d for d, v in poetry.get("dependencies", {}).items() 
-                                if d != 'python' and (not isinstance(v, dict) or not v.get('optional')))
+                                if d != 'python' and (not isinstance(v, collections.abc.Mapping) or not v.get('optional')))
         if optional_dependencies:
-            extra_dependency = project.get("optional-dependencies", {})
+            extra_dependency = dict(project.get("optional-dependencies", {}))
             extra_dependency.update(poetry.get("extras", {}))
             if '*' in optional_dependencies:
                 optional_dependencies = extra_dependency.keys()
@@ -492,35 +1132,156 @@ def generate_requirements_file_from_pyproject(include_dependencies, optional_dep
 
 
 def run(args):
-    args = merge_args(
+    if getattr(args, "profile", None):
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(_run, args)
+        finally:
+            profile.dump_stats(args.profile)
+            print("profile written to {}".format(args.profile))
+    return _run(args)
+
+
+def _run(args):
+    if getattr(args, "serve", None):
+        from liccheck.server import serve
+
+        return serve(args)
+    stats = NULL_STATS
+    if getattr(args, "stats", False) or getattr(args, "stats_file", None):
+        stats = Stats(top=args.stats_top, trace_memory=args.trace_memory)
+    stats.start()
+    try:
+        ret = _run_with_stats(args, stats)
+    finally:
+        stats.stop()
+    if stats.enabled:
+        if args.stats:
+            print("statistics:")
+            print(stats.format())
+        if args.stats_file:
+            with open(args.stats_file, "w") as f:
+                json.dump(stats.to_dict(), f, indent=2)
+    return ret
+
+
+def merged_args(args, config=None):
+    """Return the options of the command line merged with pyproject.toml"""
+    return merge_args(
         {
             "strategy_ini_file": args.strategy_ini_file,
             "requirement_txt_file": args.requirement_txt_file,
             "level": args.level,
             "reporting_txt_file": args.reporting_txt_file,
+            "report_format": args.report_format,
             "no_deps": args.no_deps,
             "dependencies": False,
             "optional_dependencies": [],
             "as_regex": False,
-        }
+            "max_paths": args.max_paths,
+            "max_depth": args.max_depth,
+            "shortest_path": args.shortest_path,
+            "backend": args.backend,
+            "paths": args.paths,
+            "cache_dir": args.cache_dir,
+            "no_cache": args.no_cache,
+            "refresh_cache": args.refresh_cache,
+            "incremental": args.incremental,
+            "jobs": args.jobs,
+        },
+        config,
     )
-    strategy = read_strategy(args["strategy_ini_file"])
+
+
+def _run_with_stats(args, stats):
+    with stats.timer("config"):
+        config = PyprojectConfig.load()
+    args = merged_args(args, config)
+    with stats.timer("config"):
+        strategy = read_strategy(args["strategy_ini_file"], config)
+    cache = None
+    if not args["no_cache"] and (args["cache_dir"] or args["refresh_cache"]):
+        cache = MetadataCache(
+            args["cache_dir"] or default_cache_dir(), refresh=args["refresh_cache"]
+        )
+    state = None
+    if args["incremental"]:
+        state = IncrementalState(
+            args["incremental"],
+            strategy_fingerprint(strategy, args["level"], args["as_regex"]),
+            cache,
+        )
     requirements_file_generated = False
     if args["dependencies"] is True or len(args["optional_dependencies"]) > 0:
         args["requirement_txt_file"] = generate_requirements_file_from_pyproject(
-            args["dependencies"], args["optional_dependencies"]
+            args["dependencies"], args["optional_dependencies"], config
         )
         requirements_file_generated = True
+    files = requirement_files(args["requirement_txt_file"])
+    # shared by all the requirement files so that distributions are scanned,
+    # read and checked once
+    index = None
+    if args["paths"]:
+        # distributions which aren't installed are only found by importlib
+        args["backend"] = IMPORTLIB
+        index = DistributionIndex(args["paths"])
+    elif args["backend"] == IMPORTLIB:
+        index = DistributionIndex()
+    memo = {}
+    verdicts = {}
+    results = []
     try:
-        return process(
-            args["requirement_txt_file"],
-            strategy,
-            args["level"],
-            args["reporting_txt_file"],
-            args["no_deps"],
-            args["as_regex"],
-        )
+        with reporting.open_writer(
+            args["reporting_txt_file"], args["report_format"]
+        ) as writer:
+            for requirement_file in files:
+                if len(files) > 1:
+                    print("==> {} <==".format(requirement_file))
+                results.append(
+                    process(
+                        requirement_file,
+                        strategy,
+                        args["level"],
+                        args["reporting_txt_file"],
+                        args["no_deps"],
+                        args["as_regex"],
+                        max_paths=args["max_paths"],
+                        max_depth=args["max_depth"],
+                        shortest_path=args["shortest_path"],
+                        backend=args["backend"],
+                        cache=cache,
+                        state=state,
+                        jobs=args["jobs"],
+                        report_format=args["report_format"],
+                        index=index,
+                        memo=memo,
+                        verdicts=verdicts,
+                        writer=writer,
+                        stats=stats,
+                    )
+                )
+        if len(files) > 1:
+            print("summary:")
+            for requirement_file, result in zip(files, results):
+                print(
+                    "    {}: {}".format(
+                        requirement_file, "passed" if result == 0 else "failed"
+                    )
+                )
+        ret = next((result for result in results if result != 0), 0)
+        if state is not None:
+            state.save()
+            stats.set("packages_rechecked", state.rechecked)
+        return ret
     finally:
+        for counter in ("license_classifications", "regex_evaluations"):
+            stats.set(counter, strategy.counters[counter])
+        if cache is not None:
+            stats.set("metadata_cache_hits", cache.hits)
+            stats.set("metadata_cache_misses", cache.misses)
+            cache.save()
         if requirements_file_generated:
             import pathlib
             import shutil
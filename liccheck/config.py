@@ -0,0 +1,79 @@
+import collections.abc
+import types
+
+PYPROJECT_TOML = "pyproject.toml"
+
+
+def load_toml(path):
+    """Parse a TOML file, with the standard library parser when available"""
+    try:
+        import tomllib
+    except ImportError:
+        import toml
+
+        return toml.load(path)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def freeze(value):
+    """Return a read-only copy of parsed TOML: mappings are wrapped in proxies
+    and lists converted to tuples"""
+    if isinstance(value, collections.abc.Mapping):
+        return types.MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable copy of a frozen value"""
+    if isinstance(value, collections.abc.Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+EMPTY = freeze({})
+
+
+class PyprojectConfig(object):
+    """The content of a pyproject.toml file, parsed once per run
+
+    A missing file gives an empty configuration.
+    """
+
+    __slots__ = ("path", "data")
+
+    def __init__(self, path=PYPROJECT_TOML, data=EMPTY):
+        super(PyprojectConfig, self).__setattr__("path", path)
+        super(PyprojectConfig, self).__setattr__("data", freeze(data))
+
+    @classmethod
+    def load(cls, path=PYPROJECT_TOML):
+        try:
+            data = load_toml(path)
+        except FileNotFoundError:
+            data = {}
+        return cls(path, data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PyprojectConfig is immutable")
+
+    @property
+    def tool(self):
+        return self.data.get("tool", EMPTY)
+
+    @property
+    def liccheck(self):
+        """The [tool.liccheck] section, None if there's none"""
+        return self.tool.get("liccheck")
+
+    @property
+    def project(self):
+        return self.data.get("project", EMPTY)
+
+    @property
+    def poetry(self):
+        return self.tool.get("poetry", EMPTY)
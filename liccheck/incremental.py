@@ -0,0 +1,112 @@
+import collections.abc
+import hashlib
+import json
+import threading
+
+from liccheck.cache import distribution_key, read_json, write_json_atomically
+from liccheck.metadata import METADATA_VERSION
+
+DEFAULT_STATE_FILE = ".liccheck-state.json"
+
+# Version of the license matching, to be bumped whenever the verdict of a
+# package may change for the same strategy, e.g. when SPDX expressions or
+# license names are matched differently, so that saved verdicts are dropped
+# after an upgrade.
+MATCHING_VERSION = 1
+
+
+def strategy_fingerprint(strategy, level, as_regex=False):
+    """Return a digest of everything a verdict depends on besides the package"""
+    data = json.dumps(
+        [
+            METADATA_VERSION,
+            MATCHING_VERSION,
+            sorted(strategy.AUTHORIZED_LICENSES),
+            sorted(strategy.UNAUTHORIZED_LICENSES),
+            sorted(
+                strategy.AUTHORIZED_PACKAGES.items()
+                if isinstance(strategy.AUTHORIZED_PACKAGES, collections.abc.Mapping)
+                else strategy.AUTHORIZED_PACKAGES
+            ),
+            str(level),
+            bool(as_regex),
+        ]
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _verdict_key(package):
+    return "|".join([package.key[0], package.version] + list(package.licenses))
+
+
+class IncrementalState(object):
+    """Package information and verdicts of the previous run
+
+    The state is used as a metadata cache by get_packages_info, so only the
+    distributions whose metadata changed are read again, and the verdicts of
+    the packages whose name, version and licenses didn't change are reused as
+    long as the strategy, level and matching mode are the same.  Package
+    information read by another METADATA_VERSION is ignored.  Only the
+    packages of the current run are saved.
+    """
+
+    def __init__(self, path, fingerprint, cache=None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.cache = cache
+        previous = read_json(path)
+        if previous.get("metadata_version") == METADATA_VERSION:
+            self.previous_packages = previous.get("packages", {})
+        else:
+            self.previous_packages = {}
+        if previous.get("fingerprint") == fingerprint:
+            self.previous_verdicts = previous.get("verdicts", {})
+        else:
+            self.previous_verdicts = {}
+        self.packages = {}
+        self.verdicts = {}
+        self.rechecked = 0
+        self.lock = threading.Lock()
+
+    def key(self, dist):
+        return distribution_key(dist)
+
+    def get(self, key):
+        package = self.previous_packages.get(key)
+        if package is not None and self.cache is not None:
+            # keep the cache warm for the runs without --incremental
+            self.cache.put(key, package)
+        elif package is None and self.cache is not None:
+            package = self.cache.get(key)
+        if package is not None:
+            with self.lock:
+                self.packages[key] = package
+            return dict(package)
+        return None
+
+    def put(self, key, package):
+        with self.lock:
+            self.packages[key] = dict(package)
+        if self.cache is not None:
+            self.cache.put(key, package)
+
+    def verdict(self, package):
+        """Return the previous verdict of an unchanged package, None otherwise"""
+        return self.previous_verdicts.get(_verdict_key(package))
+
+    def record(self, package, verdict):
+        key = _verdict_key(package)
+        if key not in self.previous_verdicts:
+            self.rechecked += 1
+        self.verdicts[key] = verdict
+
+    def save(self):
+        write_json_atomically(
+            self.path,
+            {
+                "fingerprint": self.fingerprint,
+                "metadata_version": METADATA_VERSION,
+                "packages": self.packages,
+                "verdicts": self.verdicts,
+            },
+        )
@@ -0,0 +1,151 @@
+"""Readers of the lock files of poetry, pdm, uv and PEP 751 (pylock.toml)
+
+Lock files give the whole pinned set of packages along with their
+dependencies, so no resolution is needed: only the licenses are read from
+the installed distributions.
+"""
+import collections
+import os.path
+import re
+
+from liccheck.config import load_toml
+
+LockedPackage = collections.namedtuple(
+    "LockedPackage", ["name", "version", "dependencies"]
+)
+
+regex_pylock = re.compile(r"^pylock\.[^.]+\.toml$")
+
+
+def marker_applies(marker):
+    """Return whether an environment marker matches the current environment
+
+    Dependencies only required by extras are left out.  Invalid markers are
+    considered to apply, so that the package is still checked.
+    """
+    from packaging.markers import InvalidMarker, Marker
+
+    if not marker:
+        return True
+    try:
+        return Marker(marker).evaluate({"extra": ""})
+    except InvalidMarker:
+        return True
+
+
+def _poetry_dependency_applies(constraint):
+    if isinstance(constraint, list):
+        return any(_poetry_dependency_applies(c) for c in constraint)
+    if isinstance(constraint, dict):
+        return not constraint.get("optional", False) and marker_applies(
+            constraint.get("markers")
+        )
+    return True
+
+
+def _poetry_package_applies(markers):
+    if isinstance(markers, dict):
+        # markers by dependency group
+        return any(marker_applies(marker) for marker in markers.values())
+    return marker_applies(markers)
+
+
+def read_poetry_lock(data):
+    for package in data.get("package", []):
+        # optional packages are only installed with the extras requiring them
+        if package.get("optional", False) or not _poetry_package_applies(
+            package.get("markers")
+        ):
+            continue
+        dependencies = [
+            name
+            for name, constraint in package.get("dependencies", {}).items()
+            if _poetry_dependency_applies(constraint)
+        ]
+        yield LockedPackage(package["name"], package["version"], dependencies)
+
+
+def _requirement_names(requirements):
+    from packaging.requirements import InvalidRequirement, Requirement
+
+    names = []
+    for value in requirements:
+        try:
+            requirement = Requirement(value)
+        except InvalidRequirement:
+            continue
+        if requirement.marker is None or marker_applies(str(requirement.marker)):
+            names.append(requirement.name)
+    return names
+
+
+def read_pdm_lock(data):
+    for package in data.get("package", []):
+        if not marker_applies(package.get("marker")):
+            continue
+        yield LockedPackage(
+            package["name"],
+            package["version"],
+            _requirement_names(package.get("dependencies", [])),
+        )
+
+
+def _table_names(dependencies):
+    return [
+        dependency["name"]
+        for dependency in dependencies
+        if marker_applies(dependency.get("marker"))
+    ]
+
+
+def read_uv_lock(data):
+    for package in data.get("package", []):
+        source = package.get("source", {})
+        if "editable" in source or "virtual" in source:
+            # the project itself and its workspace members
+            continue
+        if "version" not in package:
+            continue
+        yield LockedPackage(
+            package["name"],
+            package["version"],
+            _table_names(package.get("dependencies", [])),
+        )
+
+
+def read_pylock(data):
+    for package in data.get("packages", []):
+        if not marker_applies(package.get("marker")):
+            continue
+        if "version" not in package:
+            # e.g. packages installed from a directory
+            continue
+        yield LockedPackage(
+            package["name"],
+            package["version"],
+            _table_names(package.get("dependencies", [])),
+        )
+
+
+READERS = {
+    "poetry.lock": read_poetry_lock,
+    "pdm.lock": read_pdm_lock,
+    "uv.lock": read_uv_lock,
+    "pylock.toml": read_pylock,
+}
+
+
+def lockfile_reader(path):
+    """Return the reader of a lock file according to its name, None otherwise"""
+    filename = os.path.basename(path)
+    if regex_pylock.match(filename):
+        return read_pylock
+    return READERS.get(filename)
+
+
+def read_lockfile(path):
+    """Return the packages of a lock file, None if path isn't a lock file"""
+    reader = lockfile_reader(path)
+    if reader is None:
+        return None
+    return list(reader(load_toml(path)))
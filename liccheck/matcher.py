@@ -0,0 +1,85 @@
+import re
+
+REGEX_METACHARACTERS = frozenset("\\.^$*+?{}[]|()")
+
+
+def is_literal(rule):
+    """Return whether a license rule has no regular expression syntax"""
+    return not REGEX_METACHARACTERS.intersection(rule)
+
+
+def trie_pattern(words):
+    """Return a pattern matching any of words, factored as a prefix tree
+
+    e.g. ``["mit", "mit license", "mpl"]`` gives ``m(?:it(?:\\ license)?|pl)``,
+    which the regex engine walks character by character instead of trying
+    each alternative in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    alternatives = [
+        re.escape(char) + _node_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not alternatives:
+        return ""
+    is_end = "" in node
+    if len(alternatives) == 1 and not is_end:
+        return alternatives[0]
+    group = "(?:{})".format("|".join(alternatives))
+    return group + "?" if is_end else group
+
+
+def rules_pattern(rules):
+    """Return a pattern matching any of the license rules
+
+    Literal rules are merged into a prefix tree, the other ones are kept as
+    alternatives.
+    """
+    literals = [rule for rule in rules if is_literal(rule)]
+    alternatives = ["(?:{})".format(rule) for rule in rules if not is_literal(rule)]
+    if literals:
+        alternatives.insert(0, trie_pattern(literals))
+    return "|".join(alternatives)
+
+
+def compile_combined_regex(authorized_licenses, unauthorized_licenses):
+    """Compile the authorized and unauthorized rules into a single regex
+
+    Each rule set is tried in a lookahead capturing an ``authorized`` or
+    ``unauthorized`` group, so a single match call at the start of a license
+    gives both classifications, with the same result as searching each rule
+    set separately.  None is returned when the rules can't be combined, e.g.
+    if they define conflicting group names.
+    """
+    lookaheads = []
+    for group, rules in (
+        ("authorized", authorized_licenses),
+        ("unauthorized", unauthorized_licenses),
+    ):
+        if rules:
+            lookaheads.append(
+                r"(?:(?=[\s\S]*?(?P<{}>{})))?".format(group, rules_pattern(rules))
+            )
+    try:
+        return re.compile("".join(lookaheads))
+    except re.error:
+        return None
+
+
+def classify_with_regex(regex, license_str):
+    """Return (authorized, unauthorized) for a license using a combined regex"""
+    groups = regex.match(license_str).groupdict()
+    return (
+        groups.get("authorized") is not None,
+        groups.get("unauthorized") is not None,
+    )
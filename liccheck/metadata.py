@@ -0,0 +1,197 @@
+import collections
+import os.path
+import re
+
+regex_classifier = re.compile(
+    r"License(?: :: OSI Approved)?(?: :: (?P<classifier>.*))?$"
+)
+
+MetadataHeaders = collections.namedtuple(
+    "MetadataHeaders", ["name", "version", "licenses", "requires_dist", "size"]
+)
+
+# Version of the package information read from distributions, to be bumped
+# whenever the way licenses or dependencies are extracted changes, so that
+# what was cached by a previous version is read again.
+METADATA_VERSION = 3
+
+# Files holding the core metadata of a distribution, the empty name being
+# used by egg-info files.
+METADATA_FILES = ("METADATA", "PKG-INFO", "")
+
+
+def parse_headers(lines):
+    """Parse the headers of a PKG-INFO/METADATA file
+
+    Only the RFC 822 header block is read: parsing stops at the first empty
+    line, which separates the headers from the long description, whose size
+    in bytes is returned along with the headers (newlines counted as one
+    byte).  ``License-Expression`` takes precedence over ``License``, and license
+    classifiers are used when neither is specified.
+    """
+    name = None
+    version = None
+    license_expression = None
+    license = None
+    classifiers = []
+    requires_dist = []
+    size = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        size += (len(line) if line.isascii() else len(line.encode("utf-8"))) + 1
+        if not line:
+            break
+        if line[0] in " \t":
+            # continuation of a multi-line header, e.g. a full license text
+            continue
+        header, sep, value = line.partition(":")
+        if not sep:
+            continue
+        header = header.lower()
+        value = value.strip()
+        if header == "name":
+            name = value
+        elif header == "version":
+            version = value
+        elif header == "license-expression":
+            license_expression = value
+        elif header == "license":
+            if license is None:
+                license = value
+        elif header == "classifier":
+            match = regex_classifier.match(value)
+            # match might be found, but None if using the classifier:
+            # License :: OSI Approved
+            if match and match.group("classifier"):
+                classifiers.append(match.group("classifier"))
+        elif header == "requires-dist":
+            requires_dist.append(value)
+
+    licenses = classifiers
+    for value in (license_expression, license):
+        if value and value != "UNKNOWN":  # Value when license not specified.
+            licenses = [value]
+            break
+    return MetadataHeaders(name, version, licenses, requires_dist, size)
+
+
+def parse_license_headers(lines):
+    """Return the licenses declared in the headers of a PKG-INFO/METADATA file"""
+    return parse_headers(lines).licenses
+
+
+def _pkg_resources_metadata_path(dist):
+    try:
+        return dist._provider._get_metadata_path(dist.PKG_INFO)
+    except AttributeError:
+        return None
+
+
+def _read_pkg_resources_headers(dist):
+    if not dist.has_metadata(dist.PKG_INFO):
+        return parse_headers([])
+    path = _pkg_resources_metadata_path(dist)
+    if path is not None:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return parse_headers(f)
+        except (IOError, OSError):
+            # e.g. metadata stored in a zipped egg
+            pass
+    return parse_headers(dist.get_metadata(dist.PKG_INFO).splitlines())
+
+
+def _read_importlib_headers(dist):
+    path = getattr(dist, "_path", None)
+    for filename in METADATA_FILES:
+        if path is not None:
+            try:
+                with (path / filename).open(encoding="utf-8", errors="replace") as f:
+                    return parse_headers(f), filename
+            except (IOError, OSError):
+                continue
+        text = dist.read_text(filename)
+        if text is not None:
+            return parse_headers(text.splitlines()), filename
+    return parse_headers([]), None
+
+
+def metadata_file(dist):
+    """Return the path of the metadata file of a distribution, if it is on disk"""
+    if is_pkg_resources_distribution(dist):
+        path = _pkg_resources_metadata_path(dist)
+        return path if path and os.path.isfile(path) else None
+    path = getattr(dist, "_path", None)
+    if path is None:
+        # the metadata of a wheel changes along with the wheel file
+        return getattr(dist, "wheel_path", None)
+    for filename in METADATA_FILES:
+        if (path / filename).is_file():
+            return str(path / filename)
+    return None
+
+
+def is_pkg_resources_distribution(dist):
+    return hasattr(dist, "project_name")
+
+
+def get_requirements(requires_dist, extras=()):
+    """Return the requirements applying to the current environment"""
+    from packaging.requirements import InvalidRequirement, Requirement
+
+    environments = [{"extra": extra} for extra in ("",) + tuple(extras)]
+    requirements = []
+    for value in requires_dist:
+        try:
+            requirement = Requirement(value)
+        except InvalidRequirement:
+            continue
+        if requirement.marker is None or any(
+            requirement.marker.evaluate(environment) for environment in environments
+        ):
+            requirements.append(requirement)
+    return requirements
+
+
+def _read_importlib_requires_dist(dist):
+    headers, filename = _read_importlib_headers(dist)
+    requires_dist = headers.requires_dist
+    if not requires_dist and filename == "PKG-INFO":
+        # egg-info directories declare their requirements in requires.txt
+        requires_dist = dist.requires or []
+    return headers, requires_dist
+
+
+def read_requirements(dist, extras=()):
+    """Return the requirements of an importlib.metadata distribution"""
+    _, requires_dist = _read_importlib_requires_dist(dist)
+    return get_requirements(requires_dist, extras)
+
+
+def read_distribution(dist):
+    """Return the name, version, location, dependencies and licenses of a
+    distribution, along with the size of the metadata headers parsed and,
+    for importlib.metadata distributions, their Requires-Dist"""
+    if is_pkg_resources_distribution(dist):
+        headers = _read_pkg_resources_headers(dist)
+        return {
+            "name": dist.project_name,
+            "version": dist.version,
+            "location": dist.location,
+            "dependencies": [requirement.project_name for requirement in dist.requires()],
+            "licenses": headers.licenses,
+            "metadata_bytes": headers.size,
+        }
+
+    headers, requires_dist = _read_importlib_requires_dist(dist)
+    return {
+        "name": headers.name or dist.metadata["Name"],
+        "version": headers.version or dist.version,
+        "location": str(dist.locate_file("")),
+        "dependencies": [
+            requirement.name for requirement in get_requirements(requires_dist)
+        ],
+        "licenses": headers.licenses,
+        "metadata_bytes": headers.size,
+        "requires_dist": requires_dist,
+    }
@@ -0,0 +1,121 @@
+import sys
+
+from liccheck.requirements import normalize_name
+
+
+class PackageInfo(object):
+    """Name, version, location, dependencies and licenses of a distribution
+
+    Instances are immutable and hashable on their key: the normalized name,
+    version and location.  For backwards compatibility, fields can also be
+    read as items like with the dicts used before, dependencies and licenses
+    being returned as lists.
+
+    requires_dist holds the Requires-Dist of the distribution when it was
+    read, so that its dependencies can be resolved with extras without
+    reading its metadata again.  It isn't a field: it takes no part in
+    comparisons.
+    """
+
+    FIELDS = ("name", "version", "location", "dependencies", "licenses")
+
+    __slots__ = FIELDS + ("key", "requires_dist", "_parsed_version")
+
+    def __init__(
+        self,
+        name,
+        version,
+        location=None,
+        dependencies=(),
+        licenses=(),
+        requires_dist=None,
+    ):
+        set_field = super(PackageInfo, self).__setattr__
+        set_field("name", sys.intern(name))
+        set_field("version", version)
+        set_field("location", location)
+        set_field("dependencies", tuple(sys.intern(d) for d in dependencies))
+        set_field("licenses", tuple(sorted(set(licenses))))
+        set_field("key", (normalize_name(name), version, location))
+        set_field(
+            "requires_dist", None if requires_dist is None else tuple(requires_dist)
+        )
+        set_field("_parsed_version", None)
+
+    @classmethod
+    def from_dict(cls, package):
+        return cls(
+            requires_dist=package.get("requires_dist"),
+            **{field: package[field] for field in cls.FIELDS if field in package}
+        )
+
+    @classmethod
+    def coerce(cls, package):
+        """Return package as a PackageInfo, converting it from a dict if needed"""
+        if isinstance(package, cls):
+            return package
+        return cls.from_dict(package)
+
+    @property
+    def parsed_version(self):
+        """The version coerced to a semantic_version Version, as matched by the
+        authorized packages, None if it can't be"""
+        if self._parsed_version is None:
+            import semantic_version
+
+            try:
+                parsed = semantic_version.Version.coerce(self.version)
+            except ValueError:
+                parsed = False
+            super(PackageInfo, self).__setattr__("_parsed_version", parsed)
+        return self._parsed_version or None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PackageInfo is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("PackageInfo is immutable")
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        value = getattr(self, field)
+        return list(value) if isinstance(value, tuple) else value
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __contains__(self, field):
+        return field in self.FIELDS
+
+    def keys(self):
+        return list(self.FIELDS)
+
+    def to_dict(self):
+        return {field: self[field] for field in self.FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, PackageInfo):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __getstate__(self):
+        return dict(self.to_dict(), requires_dist=self.requires_dist)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return "PackageInfo({})".format(
+            ", ".join("{}={!r}".format(f, getattr(self, f)) for f in self.FIELDS)
+        )
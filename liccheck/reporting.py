@@ -0,0 +1,226 @@
+import contextlib
+import json
+
+from liccheck.requirements import normalize_name
+
+
+class DependencyRoots(object):
+    """Root requirements from which each package is required
+
+    Roots are memoized per package, so finding the roots of every package
+    visits each dependency edge about once.  Packages only required from a
+    dependency cycle have no roots.
+    """
+
+    def __init__(self, reverse_dependencies):
+        self.reverse_dependencies = reverse_dependencies
+        self.memo = {}
+
+    def _parents(self, key):
+        return self.reverse_dependencies.get(key, ())
+
+    def get(self, name):
+        key = normalize_name(name)
+        if key not in self.memo:
+            self._visit(key, name)
+        return sorted(self.memo.get(key, ()))
+
+    def _visit(self, key, name):
+        # iterative depth-first traversal, frames are
+        # [key, name, parents iterator, roots, incomplete]
+        frames = [[key, name, iter(self._parents(key)), set(), False]]
+        on_stack = {key}
+        while frames:
+            frame = frames[-1]
+            parent = next(frame[2], None)
+            if parent is not None:
+                parent_key = normalize_name(parent)
+                if parent_key in self.memo:
+                    frame[3].update(self.memo[parent_key])
+                elif parent_key in on_stack:
+                    # cycle: the roots of the parent are still being computed
+                    frame[4] = True
+                else:
+                    on_stack.add(parent_key)
+                    frames.append(
+                        [parent_key, parent, iter(self._parents(parent_key)), set(), False]
+                    )
+                continue
+            frames.pop()
+            on_stack.discard(frame[0])
+            roots = frozenset(frame[3]) if self._parents(frame[0]) else frozenset([frame[1]])
+            # partial results of packages within a cycle aren't kept, the
+            # package which started the traversal of the cycle is complete
+            if not frame[4] or not frames:
+                self.memo[frame[0]] = roots
+            if frames:
+                frames[-1][3].update(roots)
+                frames[-1][4] = frames[-1][4] or frame[4]
+
+
+class ReportWriter(object):
+    """Write one record per checked package to a report file
+
+    Records are dicts with the name, version, licenses, status, matched rule
+    and dependency roots of a package, written as soon as they are produced.
+    The matched rule is only looked up for writers which write it.
+    """
+
+    writes_rule = True
+
+    def __init__(self, f, source=None):
+        self.f = f
+        self.source = source
+
+    def begin(self):
+        pass
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+
+class TextWriter(ReportWriter):
+    writes_rule = False
+
+    def write(self, record):
+        self.f.write(
+            "{} {} {} {}\n".format(
+                record["name"],
+                record["version"],
+                (record["licenses"] or ["UNKNOWN"])[0],
+                record["status"],
+            )
+        )
+
+
+class JsonLinesWriter(ReportWriter):
+    def write(self, record):
+        self.f.write(json.dumps(record) + "\n")
+
+
+class JsonWriter(ReportWriter):
+    def begin(self):
+        self.f.write("[")
+        self.separator = "\n"
+
+    def write(self, record):
+        self.f.write(self.separator + json.dumps(record))
+        self.separator = ",\n"
+
+    def end(self):
+        self.f.write("\n]\n")
+
+
+class CsvWriter(ReportWriter):
+    FIELDS = (
+        "name", "version", "licenses", "status", "rule", "roots", "requirement_file"
+    )
+
+    def begin(self):
+        import csv
+
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(self.FIELDS)
+
+    def write(self, record):
+        self.writer.writerow(
+            [
+                record["name"],
+                record["version"],
+                "; ".join(record["licenses"]),
+                record["status"],
+                record["rule"] or "",
+                "; ".join(record["roots"]),
+                record.get("requirement_file") or "",
+            ]
+        )
+
+
+class SarifWriter(ReportWriter):
+    """Write non compliant packages as the results of a SARIF 2.1.0 log"""
+
+    RULES = {
+        "UNAUTHORIZED": ("liccheck/unauthorized", "error", "Unauthorized license"),
+        "UNKNOWN": ("liccheck/unknown", "warning", "Unknown license"),
+    }
+
+    def begin(self):
+        driver = {
+            "name": "liccheck",
+            "informationUri": "https://github.com/dhatim/python-license-check",
+            "rules": [
+                {"id": rule_id, "shortDescription": {"text": text}}
+                for rule_id, _, text in self.RULES.values()
+            ],
+        }
+        # the results are streamed into the log, which is written around them
+        opening = '{{"$schema": {}, "version": {}, "runs": [{{"tool": {}, "results": ['
+        self.f.write(
+            opening.format(
+                json.dumps("https://json.schemastore.org/sarif-2.1.0.json"),
+                json.dumps("2.1.0"),
+                json.dumps({"driver": driver}),
+            )
+        )
+        self.separator = ""
+
+    def write(self, record):
+        if record["status"] not in self.RULES:
+            return
+        rule_id, level, text = self.RULES[record["status"]]
+        location = {
+            "logicalLocations": [{"name": record["name"], "kind": "package"}]
+        }
+        if self.source:
+            location["physicalLocation"] = {"artifactLocation": {"uri": self.source}}
+        result = {
+            "ruleId": rule_id,
+            "level": level,
+            "message": {
+                "text": "{}: {} ({}) is licensed under {}".format(
+                    text,
+                    record["name"],
+                    record["version"],
+                    ", ".join(record["licenses"]) or "UNKNOWN",
+                )
+            },
+            "locations": [location],
+            "properties": {
+                "version": record["version"],
+                "licenses": record["licenses"],
+                "rule": record["rule"],
+                "roots": record["roots"],
+            },
+        }
+        self.f.write(self.separator + json.dumps(result))
+        self.separator = ","
+
+    def end(self):
+        # closes the results, the run, the runs and the log
+        self.f.write("]}]}\n")
+
+
+WRITERS = {
+    "text": TextWriter,
+    "jsonl": JsonLinesWriter,
+    "json": JsonWriter,
+    "csv": CsvWriter,
+    "sarif": SarifWriter,
+}
+FORMATS = tuple(WRITERS)
+
+
+@contextlib.contextmanager
+def open_writer(path, report_format="text", source=None):
+    """Open a report writer on path, or yield None if there's no path"""
+    if not path:
+        yield None
+        return
+    with open(path, "w", newline="") as f:
+        writer = WRITERS[report_format](f, source=source)
+        writer.begin()
+        yield writer
+        writer.end()
@@ -1,52 +1,383 @@
-import pkg_resources
+import collections
+import importlib.util
+import os.path
+import pathlib
+import re
 
-try:
-    from pip._internal.network.session import PipSession
-except ImportError:
+from liccheck.metadata import get_requirements, read_requirements
+
+# packaging.requirements, importlib.metadata and zipfile (through
+# liccheck.wheel) are imported when first needed, so that commands which
+# don't read requirements or distributions start faster.
+
+IMPORTLIB = "importlib"
+PKG_RESOURCES = "pkg_resources"
+BACKENDS = (IMPORTLIB, PKG_RESOURCES)
+# importlib.metadata finds distributions lazily, while importing pkg_resources
+# scans every sys.path entry eagerly.
+DEFAULT_BACKEND = (
+    IMPORTLIB if importlib.util.find_spec("importlib.metadata") else PKG_RESOURCES
+)
+
+
+class DistributionNotFound(Exception):
+    def __init__(self, requirement, required_by=None):
+        self.requirement = requirement
+        self.required_by = required_by
+        message = "The '{}' distribution was not found".format(requirement)
+        if required_by:
+            message += " and is required by {}".format(required_by)
+        super(DistributionNotFound, self).__init__(message)
+
+
+class VersionConflict(Exception):
+    def __init__(self, dist_name, dist_version, requirement):
+        self.requirement = requirement
+        super(VersionConflict, self).__init__(
+            "{} {} is installed but {} is required".format(
+                dist_name, dist_version, requirement
+            )
+        )
+
+
+def normalize_name(name):
+    """Normalize a project name as described in PEP 503"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class RequirementsFileError(ValueError):
+    def __init__(self, filename, line_number, message):
+        self.filename = filename
+        self.line_number = line_number
+        super(RequirementsFileError, self).__init__(
+            "{}:{}: {}".format(filename, line_number, message)
+        )
+
+
+regex_comment = re.compile(r"(^|\s+)#.*$")
+regex_env_var = re.compile(r"\$\{([A-Z0-9_]+)\}")
+regex_option = re.compile(r"^(-[A-Za-z]|--[A-Za-z][\w-]*)\s*=?\s*(.*)$")
+regex_egg_fragment = re.compile(r"#egg=([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+INCLUDE_OPTIONS = ("-r", "--requirement")
+CONSTRAINT_OPTIONS = ("-c", "--constraint")
+EDITABLE_OPTIONS = ("-e", "--editable")
+
+
+def iter_logical_lines(lines):
+    """Yield (line number, line) once comments are removed and continuations
+    joined, the line number being the one of the first physical line"""
+    buffer = []
+    start = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if start is None:
+            start = number
+        if line.endswith("\\") and not regex_comment.search(line):
+            buffer.append(line[:-1])
+            continue
+        buffer.append(line)
+        logical = regex_comment.sub("", "".join(buffer)).strip()
+        buffer = []
+        if logical:
+            yield start, logical
+        start = None
+    logical = regex_comment.sub("", "".join(buffer)).strip()
+    if logical:
+        yield start, logical
+
+
+def expand_env_vars(line):
+    """Replace ${VAR} with environment variables, as pip does"""
+    return regex_env_var.sub(
+        lambda match: os.environ.get(match.group(1), match.group(0)), line
+    )
+
+
+def _split_option(line):
+    """Return the option of a line and its value, e.g. ("-r", "other.txt")"""
+    match = regex_option.match(line)
+    if match is None:
+        return line, ""
+    return match.group(1), match.group(2).strip()
+
+
+def _requirement_from_url(value):
+    """Return the requirement of a URL or path with an #egg= fragment, or of a
+    wheel file name"""
+    from packaging.requirements import Requirement
+
+    match = regex_egg_fragment.search(value)
+    if match:
+        return Requirement(match.group(1))
+    filename = os.path.basename(value.split("#")[0].split("?")[0])
+    if filename.endswith(".whl"):
+        name, version = filename.split("-")[:2]
+        return Requirement("{}=={}".format(name, version))
+    return None
+
+
+def _parse_requirement(line):
+    from packaging.markers import Marker
+    from packaging.requirements import InvalidRequirement, Requirement
+
+    # per requirement options such as --hash start at the first token
+    # starting with a dash
+    tokens = line.split(" ")
+    for position, token in enumerate(tokens):
+        if token.startswith("-"):
+            tokens = tokens[:position]
+            break
+    value = " ".join(tokens).strip()
     try:
-        from pip._internal.download import PipSession
-    except ImportError:
-        from pip.download import PipSession
+        return Requirement(value)
+    except InvalidRequirement:
+        requirement = _requirement_from_url(value.split(";")[0].strip())
+        if requirement is None:
+            raise
+        marker = value.partition(";")[2].strip()
+        if marker:
+            requirement.marker = Marker(marker)
+        return requirement
+
+
+def iter_requirements_file(requirement_file, seen=None):
+    """Yield the requirements of a requirements file and of the files it includes
 
-try:
-    from pip._internal.req import parse_requirements as pip_parse_requirements
-except ImportError:
-    from pip.req import parse_requirements as pip_parse_requirements
+    Constraint files, editable requirements and the options which don't
+    select packages (index URLs, --pre, ...) are skipped, as are per
+    requirement options such as --hash.
+    """
+    from packaging.markers import InvalidMarker
+    from packaging.requirements import InvalidRequirement
 
-try:
-    from pip._internal.req.constructors import install_req_from_parsed_requirement
-except ImportError:
-    def install_req_from_parsed_requirement(r):
-        return r
+    seen = set() if seen is None else seen
+    path = os.path.abspath(requirement_file)
+    if path in seen:
+        return
+    seen.add(path)
+    with open(requirement_file, encoding="utf-8") as f:
+        lines = list(iter_logical_lines(f))
+    directory = os.path.dirname(requirement_file)
+    for number, line in lines:
+        line = expand_env_vars(line)
+        if line.startswith("-"):
+            option, value = _split_option(line)
+            if option in INCLUDE_OPTIONS:
+                if not value:
+                    raise RequirementsFileError(
+                        requirement_file, number, "missing requirements file"
+                    )
+                if "://" in value:
+                    raise RequirementsFileError(
+                        requirement_file, number, "remote files aren't supported"
+                    )
+                for requirement in iter_requirements_file(
+                    os.path.join(directory, value), seen
+                ):
+                    yield requirement
+            # constraints, editables and global options are skipped
+            continue
+        try:
+            yield _parse_requirement(line)
+        except (InvalidRequirement, InvalidMarker) as e:
+            raise RequirementsFileError(requirement_file, number, e)
 
 
 def parse_requirements(requirement_file):
     requirements = []
-    for req in pip_parse_requirements(requirement_file, session=PipSession()):
-        install_req = install_req_from_parsed_requirement(req)
-        if install_req.markers and not pkg_resources.evaluate_marker(str(install_req.markers)):
+    for requirement in iter_requirements_file(requirement_file):
+        if requirement.marker is not None and not requirement.marker.evaluate():
             # req should not installed due to env markers
             continue
-        elif install_req.editable:
-            # skip editable req as they are failing in the resolve phase
-            continue
-        requirements.append(pkg_resources.Requirement.parse(str(install_req.req)))
+        requirements.append(requirement)
     return requirements
 
 
-def resolve_without_deps(requirements):
-    working_set = pkg_resources.working_set
-    for req in requirements:
+def parse_metadata_dirname(dist):
+    """Return the name and version encoded in a .dist-info/.egg-info path"""
+    path = getattr(dist, "_path", None)
+    if path is not None:
+        dirname = path.name
+    elif hasattr(dist, "wheel_path"):
+        dirname = dist.metadata_dir
+    else:
+        return None, None
+    stem, ext = os.path.splitext(dirname)
+    if ext not in (".dist-info", ".egg-info"):
+        return None, None
+    parts = stem.split("-")
+    return parts[0], (parts[1] if len(parts) > 1 else None)
+
+
+def find_distributions(paths):
+    """Yield the distributions found in paths, without installing them
+
+    Paths are either directories such as site-packages, which are searched
+    for metadata directories and wheel files, metadata directories
+    themselves, or wheel files.
+    """
+    import importlib.metadata as importlib_metadata
+
+    from liccheck.wheel import WheelDistribution, is_wheel
+
+    for path in paths:
+        path = os.path.expanduser(os.fspath(path))
+        if is_wheel(path):
+            yield WheelDistribution(path)
+        elif path.rstrip("/\\").endswith((".dist-info", ".egg-info")):
+            yield importlib_metadata.PathDistribution(pathlib.Path(path))
+        elif os.path.isdir(path):
+            for dist in importlib_metadata.distributions(path=[path]):
+                yield dist
+            for filename in sorted(os.listdir(path)):
+                if is_wheel(os.path.join(path, filename)):
+                    yield WheelDistribution(os.path.join(path, filename))
+
+
+class DistributionIndex(object):
+    """Installed distributions indexed by normalized name
+
+    The index is built on the first lookup by listing the metadata directories
+    of the sys.path entries (or of the given paths, see find_distributions)
+    once, without reading any metadata file, so that each lookup afterwards is
+    a dict access.  As with the import system, the first distribution found on
+    the path wins.
+    """
+
+    def __init__(self, paths=None):
+        self.paths = paths
+        self._distributions = None
+
+    def _build(self):
+        distributions = {}
+        if self.paths is None:
+            import importlib.metadata as importlib_metadata
+
+            found = importlib_metadata.distributions()
+        else:
+            found = find_distributions(self.paths)
+        for dist in found:
+            name, _ = parse_metadata_dirname(dist)
+            if name is None:
+                name = dist.metadata["Name"]
+            if name:
+                distributions.setdefault(normalize_name(name), dist)
+        return distributions
+
+    @property
+    def distributions(self):
+        if self._distributions is None:
+            self._distributions = self._build()
+        return self._distributions
+
+    def get(self, name):
+        return self.distributions.get(normalize_name(name))
+
+    def __len__(self):
+        return len(self.distributions)
+
+
+def get_version(dist):
+    _, version = parse_metadata_dirname(dist)
+    return version or dist.version
+
+
+def _find_distribution(index, requirement, required_by=None):
+    dist = index.get(requirement.name)
+    if dist is None:
+        raise DistributionNotFound(requirement, required_by)
+    version = get_version(dist)
+    if not requirement.specifier.contains(version, prereleases=True):
+        raise VersionConflict(requirement.name, version, requirement)
+    return dist
+
+
+def _to_pkg_resources(requirements):
+    import pkg_resources
+
+    return [pkg_resources.Requirement.parse(str(req)) for req in requirements]
+
+
+def _from_pkg_resources_error(error):
+    """Return the liccheck exception of a pkg_resources resolution error"""
+    import pkg_resources
+
+    if isinstance(error, pkg_resources.VersionConflict):
+        return VersionConflict(error.dist.project_name, error.dist.version, error.req)
+    requirers = ", ".join(sorted(error.requirers or ()))
+    return DistributionNotFound(error.req, requirers or None)
+
+
+def resolve_without_deps(requirements, backend=DEFAULT_BACKEND, index=None):
+    if backend == PKG_RESOURCES:
+        import pkg_resources
+
+        working_set = pkg_resources.working_set
+        # Environment is itself indexed by project key, build it only once
         env = pkg_resources.Environment(working_set.entries)
-        dist = env.best_match(
-            req=req,
-            working_set=working_set,
-            installer=None,
-            replace_conflicting=False,
-        )
-        yield dist
+        for req in _to_pkg_resources(requirements):
+            try:
+                dist = env.best_match(
+                    req=req,
+                    working_set=working_set,
+                    installer=None,
+                    replace_conflicting=False,
+                )
+            except pkg_resources.VersionConflict as e:
+                raise _from_pkg_resources_error(e)
+            if dist is None:
+                raise DistributionNotFound(req)
+            yield dist
+        return
+
+    if index is None:
+        index = DistributionIndex()
+    for req in requirements:
+        yield _find_distribution(index, req)
 
 
-def resolve(requirements):
-    for dist in pkg_resources.working_set.resolve(requirements):
-        yield dist
+def resolve(requirements, backend=DEFAULT_BACKEND, index=None, requires_dist=None):
+    """Yield the distributions of requirements and of their dependencies
+
+    With the importlib backend, requires_dist can return the Requires-Dist of
+    a distribution, e.g. from the metadata already read, None if it should be
+    read from the distribution.
+    """
+    if backend == PKG_RESOURCES:
+        import pkg_resources
+
+        try:
+            dists = pkg_resources.working_set.resolve(_to_pkg_resources(requirements))
+        except (pkg_resources.DistributionNotFound, pkg_resources.VersionConflict) as e:
+            raise _from_pkg_resources_error(e)
+        for dist in dists:
+            yield dist
+        return
+
+    if index is None:
+        index = DistributionIndex()
+    # breadth-first traversal of the requirements, as done by pkg_resources
+    queue = collections.deque((req, None) for req in requirements)
+    found = {}
+    processed = set()
+    while queue:
+        req, required_by = queue.popleft()
+        key = normalize_name(req.name)
+        extras = frozenset(req.extras)
+        if (key, extras) in processed:
+            continue
+        processed.add((key, extras))
+        dist = found.get(key)
+        if dist is None:
+            dist = found[key] = _find_distribution(index, req, required_by)
+            yield dist
+        elif not req.specifier.contains(get_version(dist), prereleases=True):
+            raise VersionConflict(req.name, get_version(dist), req)
+        requires = None if requires_dist is None else requires_dist(dist)
+        if requires is None:
+            dependencies = read_requirements(dist, req.extras)
+        else:
+            dependencies = get_requirements(requires, req.extras)
+        for dependency in dependencies:
+            queue.append((dependency, req.name))
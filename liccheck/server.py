@@ -0,0 +1,280 @@
+"""liccheck --serve: answer checks from memory over a Unix socket
+
+Requests and responses are JSON objects, one per line:
+
+    {"command": "check", "requirement_file": "/abs/path/requirements.txt"}
+    {"command": "invalidate"}
+    {"command": "ping"}
+    {"command": "shutdown"}
+
+The installed distributions, the strategy and the results of the checks are
+kept between requests.  The site-packages directories, pyproject.toml, the
+strategy file and the checked requirement files are polled for changes:
+when a directory changes the distributions are scanned again, but only the
+metadata of reinstalled distributions is read again.
+"""
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+
+from liccheck.cache import MemoryCache
+from liccheck.checker import Checker
+from liccheck.command_line import InvalidAuthorizedPackages, merged_args
+from liccheck.config import PyprojectConfig
+from liccheck.requirements import IMPORTLIB, RequirementsFileError
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class Watcher(object):
+    """Poll the modification time of files and directories
+
+    A directory is modified when an entry is added, removed or renamed in
+    it, which is what installing or removing a distribution does.
+    """
+
+    def __init__(self, paths=()):
+        self.mtimes = {}
+        self.lock = threading.Lock()
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        with self.lock:
+            if path not in self.mtimes:
+                self.mtimes[path] = _mtime(path)
+
+    def changed(self):
+        """Return the paths modified since the previous call"""
+        with self.lock:
+            changed = []
+            for path, mtime in self.mtimes.items():
+                current = _mtime(path)
+                if current != mtime:
+                    self.mtimes[path] = current
+                    changed.append(path)
+            return changed
+
+
+class LicenseServer(object):
+    """Check requirement files with a Checker kept up to date
+
+    load_checker is called to create the Checker, and again when one of the
+    config_files changes.
+    """
+
+    def __init__(self, load_checker, config_files=(), site_dirs=()):
+        self.load_checker = load_checker
+        self.checker = load_checker()
+        self.config = Watcher(config_files)
+        self.environment = Watcher(site_dirs)
+        self.requirements = Watcher()
+        self.results = {}
+        # incremented on each invalidation, so that a check running meanwhile
+        # doesn't store a stale result
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def check(self, requirement_file):
+        with self.lock:
+            result = self.results.get(requirement_file)
+            generation = self.generation
+            checker = self.checker
+        if result is None:
+            # watched before the check, so that a change during it is seen
+            self.requirements.add(requirement_file)
+            if not os.path.isfile(requirement_file):
+                raise FileNotFoundError(
+                    "no requirement file {}".format(requirement_file)
+                )
+            result = checker.check_requirements(requirement_file).to_dict()
+            with self.lock:
+                if generation == self.generation:
+                    self.results[requirement_file] = result
+        return result
+
+    def invalidate(self, checker=None):
+        """Forget the results, and the installed distributions unless a new
+        checker is given"""
+        if checker is None:
+            self.checker.invalidate()
+        with self.lock:
+            if checker is not None:
+                self.checker = checker
+            self.results.clear()
+            self.generation += 1
+
+    def poll(self):
+        """Invalidate what changed since the previous poll"""
+        if self.config.changed():
+            try:
+                checker = self.load_checker()
+            except Exception as e:
+                print("liccheck: configuration not reloaded: {}".format(e))
+            else:
+                # the new checker keeps the metadata cache of the previous one
+                self.environment.changed()
+                self.requirements.changed()
+                self.invalidate(checker)
+                return
+        if self.environment.changed():
+            self.requirements.changed()
+            self.invalidate()
+            return
+        changed = self.requirements.changed()
+        if changed:
+            with self.lock:
+                for path in changed:
+                    self.results.pop(path, None)
+                self.generation += 1
+
+    def handle(self, message):
+        """Return the response to a request"""
+        command = message.get("command")
+        if command == "check":
+            return self.check(os.path.abspath(message["requirement_file"]))
+        if command == "invalidate":
+            self.invalidate()
+            return {"invalidated": True}
+        if command == "ping":
+            return {"pid": os.getpid()}
+        raise ValueError("unknown command {!r}".format(command))
+
+
+def _error_message(error):
+    if isinstance(error, RequirementsFileError):
+        # the message quotes the line, and the file may be any file the
+        # daemon can read
+        return "{}: {}:{}: invalid requirement".format(
+            type(error).__name__, error.filename, error.line_number
+        )
+    return "{}: {}".format(type(error).__name__, error)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                message = json.loads(line.decode("utf-8"))
+                if message.get("command") == "shutdown":
+                    response = {"shutdown": True}
+                    # shutdown() waits for serve_forever(), which runs this
+                    threading.Thread(target=self.server.shutdown).start()
+                else:
+                    response = self.server.license_server.handle(message)
+            except Exception as e:
+                response = {"error": _error_message(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class UnixSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, license_server):
+        if os.path.exists(socket_path):
+            # left by a previous server, unless one is still listening
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                os.remove(socket_path)
+            else:
+                raise OSError("a liccheck server is listening on {}".format(socket_path))
+            finally:
+                probe.close()
+        self.license_server = license_server
+        socketserver.UnixStreamServer.__init__(self, socket_path, _RequestHandler)
+
+    def server_bind(self):
+        # the daemon reads the files it is asked to check, keep it to its user
+        # from the start, whatever the umask
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def _poll_forever(license_server, interval, stopped):
+    while not stopped.wait(interval):
+        license_server.poll()
+
+
+def site_directories(paths=None):
+    """Return the directories where distributions are installed"""
+    return [
+        os.path.abspath(path) for path in (paths or sys.path) if os.path.isdir(path)
+    ]
+
+
+def serve(args):
+    if not hasattr(socket, "AF_UNIX"):
+        print("liccheck: --serve needs Unix sockets")
+        return 1
+    options = merged_args(args, PyprojectConfig.load())
+    cache = MemoryCache()
+
+    def load_checker():
+        config = PyprojectConfig.load()
+        options = merged_args(args, config)
+        return Checker.from_strategy_file(
+            options["strategy_ini_file"],
+            config,
+            level=options["level"],
+            as_regex=options["as_regex"],
+            no_deps=options["no_deps"],
+            # pkg_resources can't see the distributions installed meanwhile
+            backend=IMPORTLIB,
+            paths=options["paths"],
+            cache=cache,
+            jobs=options["jobs"],
+        )
+
+    try:
+        license_server = LicenseServer(
+            load_checker,
+            config_files=[
+                os.path.abspath("pyproject.toml"),
+                os.path.abspath(options["strategy_ini_file"]),
+            ],
+            site_dirs=site_directories(options["paths"]),
+        )
+    except FileNotFoundError:
+        print(
+            "Need to either configure pyproject.toml or provide an existing strategy file"
+        )
+        return 1
+    except InvalidAuthorizedPackages as e:
+        print(e)
+        return 1
+    server = UnixSocketServer(args.serve, license_server)
+    stopped = threading.Event()
+    poller = threading.Thread(
+        target=_poll_forever, args=(license_server, args.poll_interval, stopped)
+    )
+    poller.daemon = True
+    poller.start()
+    print("liccheck: serving on {}".format(args.serve))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        server.server_close()
+    return 0
@@ -0,0 +1,246 @@
+"""SPDX license expressions
+
+See https://spdx.github.io/spdx-spec/v2.3/SPDX-license-expressions/
+"""
+import collections
+import itertools
+import re
+
+License = collections.namedtuple("License", ["id"])
+With = collections.namedtuple("With", ["license", "exception"])
+And = collections.namedtuple("And", ["operands"])
+Or = collections.namedtuple("Or", ["operands"])
+
+OPERATORS = ("AND", "OR", "WITH")
+
+regex_token = re.compile(r"\s*(\(|\)|[^\s()]+)")
+regex_idstring = re.compile(r"^[A-Za-z0-9.\-:]+\+?$")
+
+# Common free-text spellings, trove classifiers (with and without their
+# "License" suffix, which liccheck strips) and SPDX identifiers, by lower
+# case spelling.  Ambiguous names such as "BSD License", which may be any of
+# the 2, 3 or 4 clause variants, are deliberately left out.
+SPDX_IDS = {
+    "Apache-2.0": [
+        "apache 2",
+        "apache 2.0",
+        "apache license 2.0",
+        "apache license, version 2.0",
+        "apache license version 2.0",
+        "apache software",
+        "apache software license",
+        "apache software license 2.0",
+        "apache-2",
+        "apache2",
+        "asl 2.0",
+    ],
+    "BSD-2-Clause": [
+        "2-clause bsd",
+        "bsd 2-clause",
+        "bsd 2-clause license",
+        "freebsd",
+        "simplified bsd",
+        "simplified bsd license",
+    ],
+    "BSD-3-Clause": [
+        "3-clause bsd",
+        "bsd 3-clause",
+        "bsd 3-clause license",
+        "modified bsd",
+        "new bsd",
+        "new bsd license",
+        "revised bsd",
+    ],
+    "ISC": ["isc license", "isc license (iscl)", "iscl"],
+    "MIT": ["expat", "mit license", "the mit license"],
+    "MPL-2.0": ["mozilla public license 2.0 (mpl 2.0)", "mpl 2.0", "mpl2"],
+    "PSF-2.0": [
+        "psf",
+        "psf license",
+        "python software foundation",
+        "python software foundation license",
+    ],
+    "ZPL-2.1": ["zope public", "zope public license", "zpl 2.1"],
+    "Unlicense": ["the unlicense", "the unlicense (unlicense)"],
+    "CC0-1.0": [
+        "cc0",
+        "cc0 1.0 universal (cc0 1.0) public domain dedication",
+    ],
+    "EPL-2.0": ["eclipse public license 2.0 (epl-2.0)", "epl 2.0"],
+    "GPL-2.0-only": [
+        "gnu general public license v2 (gplv2)",
+        "gpl v2",
+        "gpl-2.0",
+        "gplv2",
+    ],
+    "GPL-2.0-or-later": [
+        "gnu general public license v2 or later (gplv2+)",
+        "gpl-2.0+",
+        "gplv2+",
+    ],
+    "GPL-3.0-only": [
+        "gnu general public license v3 (gplv3)",
+        "gpl v3",
+        "gpl-3.0",
+        "gplv3",
+    ],
+    "GPL-3.0-or-later": [
+        "gnu general public license v3 or later (gplv3+)",
+        "gpl-3.0+",
+        "gplv3+",
+    ],
+    "LGPL-2.0-only": ["gnu lesser general public license v2 (lgplv2)", "lgpl-2.0"],
+    "LGPL-2.0-or-later": [
+        "gnu lesser general public license v2 or later (lgplv2+)",
+        "lgpl-2.0+",
+    ],
+    "LGPL-3.0-only": [
+        "gnu lesser general public license v3 (lgplv3)",
+        "lgpl v3",
+        "lgpl-3.0",
+    ],
+    "LGPL-3.0-or-later": [
+        "gnu lesser general public license v3 or later (lgplv3+)",
+        "lgpl-3.0+",
+    ],
+    "AGPL-3.0-only": [
+        "gnu affero general public license v3",
+        "gnu affero general public license v3 (agplv3)",
+        "agpl-3.0",
+    ],
+    "AGPL-3.0-or-later": [
+        "gnu affero general public license v3 or later (agplv3+)",
+        "agpl-3.0+",
+    ],
+}
+
+SPDX_INDEX = {
+    spelling: spdx_id
+    for spdx_id, spellings in SPDX_IDS.items()
+    for spelling in [spdx_id.lower()] + spellings
+}
+
+
+class ParseError(ValueError):
+    pass
+
+
+def normalize_license(name):
+    """Return the SPDX identifier of a license name, None if it isn't known"""
+    return SPDX_INDEX.get(" ".join(name.lower().split()))
+
+
+def parse(expression):
+    """Parse an SPDX license expression into a tree of License/With/And/Or
+
+    Only upper case operators are recognized, so that free-text licenses such
+    as "GNU Library or Lesser General Public License (LGPL)" are rejected with
+    a ParseError instead of being split.
+    """
+    tokens = regex_token.findall(expression)
+    if not tokens:
+        raise ParseError(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        token = peek()
+        position += 1
+        return token
+
+    def parse_or():
+        operands = [parse_and()]
+        while peek() == "OR":
+            take()
+            operands.append(parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and():
+        operands = [parse_with()]
+        while peek() == "AND":
+            take()
+            operands.append(parse_with())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_with():
+        operand = parse_atom()
+        if peek() == "WITH":
+            if not isinstance(operand, License):
+                # an exception only applies to a single license
+                raise ParseError(expression)
+            take()
+            exception = take()
+            if exception is None or not _is_idstring(exception):
+                raise ParseError(expression)
+            return With(operand, exception)
+        return operand
+
+    def parse_atom():
+        token = take()
+        if token == "(":
+            node = parse_or()
+            if take() != ")":
+                raise ParseError(expression)
+            return node
+        if token is None or not _is_idstring(token):
+            raise ParseError(expression)
+        return License(token)
+
+    tree = parse_or()
+    if peek() is not None:
+        raise ParseError(expression)
+    return tree
+
+
+def _is_idstring(token):
+    return token not in OPERATORS and regex_idstring.match(token) is not None
+
+
+def to_options(tree):
+    """Return the alternatives of an expression, each one a tuple of licenses
+    which all apply (the disjunctive normal form of the expression)"""
+    if isinstance(tree, Or):
+        return [option for operand in tree.operands for option in to_options(operand)]
+    if isinstance(tree, And):
+        return [
+            tuple(itertools.chain.from_iterable(product))
+            for product in itertools.product(*(to_options(o) for o in tree.operands))
+        ]
+    return [(tree,)]
+
+
+def term_name(term):
+    """Return the lower case name of a License or With term"""
+    if isinstance(term, With):
+        return "{} with {}".format(term_name(term.license), term.exception.lower())
+    return term.id.lower()
+
+
+def classify_term(term, classify):
+    """Return (authorized, unauthorized) for a License or With term
+
+    An exception only grants additional permissions: a license with an
+    exception is authorized if either the whole term or the license alone is
+    authorized, and unauthorized if the whole term is, or if the license alone
+    is and the whole term isn't explicitly authorized.
+    """
+    authorized, unauthorized = classify(term_name(term))
+    if isinstance(term, With):
+        license_authorized, license_unauthorized = classify_term(term.license, classify)
+        return (
+            authorized or license_authorized,
+            unauthorized or (license_unauthorized and not authorized),
+        )
+    return authorized, unauthorized
+
+
+def classify_option(option, classify):
+    """Return (authorized, unauthorized) for licenses which all apply"""
+    classifications = [classify_term(term, classify) for term in option]
+    return (
+        all(authorized for authorized, _ in classifications),
+        any(unauthorized for _, unauthorized in classifications),
+    )
@@ -0,0 +1,125 @@
+import collections
+import contextlib
+import heapq
+import threading
+import time
+
+
+class Stats(object):
+    """Wall time of the phases of a run, counters and slowest distributions
+
+    The time of a phase is accumulated over all its timers, so that phases
+    which are interleaved, such as checking and reporting, are still told
+    apart.
+    """
+
+    enabled = True
+
+    def __init__(self, top=10, trace_memory=False):
+        self.top = top
+        self.trace_memory = trace_memory
+        self.phases = collections.OrderedDict()
+        self.counters = collections.Counter()
+        self.slowest = []  # heap of (seconds, name), the fastest first
+        self.peak_memory = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    def stop(self):
+        if not self.trace_memory:
+            return
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def add_time(self, phase, seconds):
+        with self.lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def count(self, counter, value=1):
+        with self.lock:
+            self.counters[counter] += value
+
+    def set(self, counter, value):
+        with self.lock:
+            self.counters[counter] = value
+
+    def record_distribution(self, name, seconds):
+        """Record the time spent reading the metadata of a distribution"""
+        with self.lock:
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, (seconds, name))
+            elif self.slowest and seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, name))
+
+    def to_dict(self):
+        return {
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "slowest_distributions": [
+                {"name": name, "seconds": seconds}
+                for seconds, name in sorted(self.slowest, reverse=True)
+            ],
+            "peak_memory": self.peak_memory,
+        }
+
+    def format(self):
+        lines = ["phases:"]
+        lines.extend(
+            "    {:<12} {:10.2f} ms".format(phase, seconds * 1000)
+            for phase, seconds in self.phases.items()
+        )
+        lines.append("counters:")
+        lines.extend(
+            "    {:<28} {}".format(counter, value)
+            for counter, value in sorted(self.counters.items())
+        )
+        if self.slowest:
+            lines.append("slowest distributions:")
+            lines.extend(
+                "    {:<28} {:10.2f} ms".format(name, seconds * 1000)
+                for seconds, name in sorted(self.slowest, reverse=True)
+            )
+        if self.peak_memory is not None:
+            lines.append("peak memory: {:.1f} MiB".format(self.peak_memory / 2 ** 20))
+        return "\n".join(lines)
+
+
+class NullStats(Stats):
+    """Stats discarding everything, used when --stats isn't given"""
+
+    enabled = False
+
+    def add_time(self, phase, seconds):
+        pass
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        yield
+
+    def count(self, counter, value=1):
+        pass
+
+    def set(self, counter, value):
+        pass
+
+    def record_distribution(self, name, seconds):
+        pass
+
+
+NULL_STATS = NullStats()
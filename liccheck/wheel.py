@@ -0,0 +1,53 @@
+import os.path
+import pathlib
+import posixpath
+import zipfile
+
+import importlib.metadata as importlib_metadata
+
+
+class WheelDistribution(importlib_metadata.Distribution):
+    """A distribution read from a wheel file, without extracting it
+
+    Opening the zip file only reads its central directory, the metadata files
+    are then read from their offsets.  The archive is opened for each read, so
+    that scanning many wheels doesn't keep them all open.
+    """
+
+    def __init__(self, wheel_path):
+        self.wheel_path = os.fspath(wheel_path)
+        self._metadata_dir = None
+
+    @property
+    def metadata_dir(self):
+        """The name of the .dist-info directory of the wheel"""
+        if self._metadata_dir is None:
+            with zipfile.ZipFile(self.wheel_path) as wheel:
+                for name in wheel.namelist():
+                    directory, _, filename = name.partition("/")
+                    if directory.endswith(".dist-info") and filename == "METADATA":
+                        self._metadata_dir = directory
+                        break
+                else:
+                    raise ValueError(
+                        "{} has no .dist-info directory".format(self.wheel_path)
+                    )
+        return self._metadata_dir
+
+    def read_text(self, filename):
+        try:
+            with zipfile.ZipFile(self.wheel_path) as wheel:
+                data = wheel.read(posixpath.join(self.metadata_dir, filename))
+        except (KeyError, ValueError):
+            return None
+        return data.decode("utf-8", errors="replace")
+
+    def locate_file(self, path):
+        return pathlib.Path(self.wheel_path, path)
+
+    def __repr__(self):
+        return "WheelDistribution({!r})".format(self.wheel_path)
+
+
+def is_wheel(path):
+    return path.endswith(".whl") and os.path.isfile(path)
@@ -76,7 +76,7 @@ setup(
 
     python_requires='>=3.5',
 
-    install_requires=['semantic_version>=2.7.0', 'toml'],
+    install_requires=['packaging', 'semantic_version>=2.7.0', 'toml'],
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.  If using Python 2.6 or less, then these
@@ -96,7 +96,8 @@ setup(
     # pip to create the appropriate form of executable for the target platform.
     entry_points={
         'console_scripts': [
-            'liccheck=liccheck.command_line:main'
+            'liccheck=liccheck.command_line:main',
+            'liccheck-client=liccheck.client:main'
         ],
     },
 )
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks")
+
+
+@pytest.mark.parametrize("shape", ["flat", "tree", "diamond", "random"])
+def test_process_phases_benchmark(tmp_path, shape):
+    output = tmp_path.joinpath("results.json")
+    subprocess.check_call(
+        [
+            sys.executable,
+            os.path.join(BENCHMARKS, "process_phases.py"),
+            "--packages", "30",
+            "--shape", shape,
+            "--description-size", "100",
+            "--repeat", "1",
+            "--output", str(output),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    results = json.loads(output.read_text())
+    assert results["packages_checked"] == 30
+    assert sorted(results["phases"]) == sorted(
+        ["parse", "resolve", "metadata", "check", "report", "total"]
+    )
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from liccheck import metadata
+from liccheck.cache import MetadataCache
+from liccheck.command_line import get_packages_info
+from liccheck.metadata import METADATA_VERSION
+from liccheck.requirements import DistributionIndex
+
+
+@pytest.fixture
+def dist(tmp_path):
+    site_packages = tmp_path.joinpath("site-packages")
+    dist_info = site_packages.joinpath("example-1.0.dist-info")
+    dist_info.mkdir(parents=True)
+    with open(str(dist_info.joinpath("METADATA")), "w") as f:
+        f.write("Metadata-Version: 2.1\nName: example\nVersion: 1.0\nLicense: MIT\n")
+    return DistributionIndex(paths=[str(site_packages)]).get("example")
+
+
+def test_cache_roundtrip(tmp_path, dist):
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    key = cache.key(dist)
+    assert key.startswith("example|1.0|")
+    assert cache.get(key) is None
+    cache.put(key, {"name": "example", "licenses": ["MIT"]})
+    cache.save()
+
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    assert cache.get(key) == {"name": "example", "licenses": ["MIT"]}
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert MetadataCache(str(tmp_path.joinpath("cache")), refresh=True).get(key) is None
+
+
+def test_cache_key_changes_with_metadata(dist):
+    cache = MetadataCache("unused")
+    key = cache.key(dist)
+    metadata = str(dist._path.joinpath("METADATA"))
+    with open(metadata, "a") as f:
+        f.write("Classifier: License :: OSI Approved :: MIT License\n")
+    assert cache.key(dist) != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = MetadataCache(str(tmp_path), max_entries=2)
+    for i in range(3):
+        cache.put(str(i), {})
+        cache.entries[str(i)]["used"] = i
+    cache.save()
+    assert sorted(MetadataCache(str(tmp_path)).entries) == ["1", "2"]
+    assert os.listdir(str(tmp_path)) == [MetadataCache.FILENAME]
+
+
+def test_get_packages_info_uses_cache(tmp_path, tmpfile, mocker):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("pip\n")
+    tmpfh.close()
+    cache = MetadataCache(str(tmp_path))
+    packages = get_packages_info(tmppath, no_deps=True, cache=cache)
+    read_distribution = mocker.patch("liccheck.command_line.read_distribution")
+    assert get_packages_info(tmppath, no_deps=True, cache=cache) == packages
+    read_distribution.assert_not_called()
+
+
+def test_cache_file_is_versioned(tmp_path):
+    assert MetadataCache.FILENAME == "metadata-v{}.json".format(METADATA_VERSION)
+    stale = tmp_path.joinpath("metadata-v{}.json".format(METADATA_VERSION - 1))
+    stale.write_text('{"key": {"package": {"name": "pip"}, "used": 0}}')
+    assert MetadataCache(str(tmp_path)).get("key") is None
+
+
+def test_warm_cache_reads_no_metadata(tmp_path, mocker):
+    site_packages = tmp_path.joinpath("site-packages")
+    site_packages.mkdir()
+    for name, requires in (("foo", ["bar; extra == 'extra'"]), ("bar", [])):
+        dist_info = site_packages.joinpath("{}-1.0.dist-info".format(name))
+        dist_info.mkdir()
+        dist_info.joinpath("METADATA").write_text(
+            "Name: {}\nVersion: 1.0\nLicense: MIT\n".format(name)
+            + "".join("Requires-Dist: {}\n".format(r) for r in requires)
+        )
+    req_path = tmp_path.joinpath("requirements.txt")
+    req_path.write_text("foo[extra]\n")
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    index = DistributionIndex(paths=[str(site_packages)])
+    packages = get_packages_info(str(req_path), cache=cache, index=index)
+    cache.save()
+
+    read_headers = mocker.spy(metadata, "_read_importlib_headers")
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    index = DistributionIndex(paths=[str(site_packages)])
+    assert get_packages_info(str(req_path), cache=cache, index=index) == packages
+    assert [p.name for p in packages] == ["bar", "foo"]
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert read_headers.call_count == 0
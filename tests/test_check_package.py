@@ -1,6 +1,6 @@
 import pytest
 
-from liccheck.command_line import check_package, Strategy, Reason, Level
+from liccheck.command_line import check_package, get_matched_rule, InvalidAuthorizedPackages, Strategy, Reason, Level
 
 OK = Reason.OK
 UNAUTH = Reason.UNAUTHORIZED
@@ -127,4 +127,109 @@ def test_check_package_splits_licenses_with_SPDX_OR():
     }
     assert check_package(mit_strategy, package, Level.STANDARD, False) is OK
     assert check_package(apache_strategy, package, Level.STANDARD, False) is OK
-    assert check_package(gpl_strategy, package, Level.STANDARD, False) is UNKNOWN
\ No newline at end of file
+    assert check_package(gpl_strategy, package, Level.STANDARD, False) is UNKNOWN
+
+
+@pytest.mark.parametrize("as_regex", [False, True])
+def test_strategy_classify_is_memoized(as_regex):
+    strategy = Strategy(
+        authorized_licenses=["mit"],
+        unauthorized_licenses=["gpl"],
+        authorized_packages={},
+    )
+    assert strategy.classify("mit", as_regex) == (True, False)
+    assert strategy.classify("gpl", as_regex) == (False, True)
+    assert strategy.classify("unknown", as_regex) == (False, False)
+    strategy.AUTHORIZED_REGEX = strategy.UNAUTHORIZED_REGEX = None
+    assert strategy.classify("mit", as_regex) == (True, False)
+    assert strategy.counters["license_classifications"] == 3
+
+
+def test_strategy_counts_regex_evaluations():
+    strategy = Strategy(
+        authorized_licenses=["mit", "bsd"],
+        unauthorized_licenses=["gpl"],
+        authorized_packages={},
+    )
+    strategy.classify("bsd", as_regex=True)
+    strategy.classify("bsd", as_regex=True)
+    assert strategy.counters["regex_evaluations"] == 1
+    assert strategy.matching_rule("bsd", as_regex=True) == "bsd"
+    assert strategy.counters["regex_evaluations"] == 3
+    assert strategy.matching_rule("bsd", as_regex=True) == "bsd"
+    assert strategy.counters["regex_evaluations"] == 3
+    strategy.classify("bsd")
+    strategy.matching_rule("bsd")
+    assert strategy.counters["regex_evaluations"] == 3
+    assert strategy.counters["license_classifications"] == 2
+
+
+@pytest.mark.parametrize(
+    "authorized_packages",
+    [{"Django": ">=3"}, ["django: >=3"], {"DJANGO": ">=3"}],
+)
+def test_authorized_packages_use_normalized_names(authorized_packages):
+    strategy = Strategy(
+        authorized_licenses=[],
+        unauthorized_licenses=[],
+        authorized_packages=authorized_packages,
+    )
+    for name in ("Django", "django"):
+        assert check_package(strategy, {"name": name, "version": "4.2", "licenses": []}) is OK
+        assert check_package(strategy, {"name": name, "version": "2.2", "licenses": []}) is UNKNOWN
+
+
+def test_authorized_package_without_version():
+    strategy = Strategy(
+        authorized_licenses=[],
+        unauthorized_licenses=[],
+        authorized_packages={"whitelisted": ""},
+    )
+    package = {"name": "whitelisted", "version": "2", "licenses": []}
+    assert check_package(strategy, package, Level.STANDARD) is OK
+    assert check_package(strategy, package, Level.CAUTIOUS) is UNKNOWN
+
+
+def test_authorized_package_with_unparsable_version():
+    strategy = Strategy(
+        authorized_licenses=[],
+        unauthorized_licenses=[],
+        authorized_packages={"whitelisted": ">=1"},
+    )
+    package = {"name": "whitelisted", "version": "dev", "licenses": []}
+    assert check_package(strategy, package, Level.STANDARD) is UNKNOWN
+
+
+def test_invalid_authorized_packages_are_reported_up_front():
+    with pytest.raises(InvalidAuthorizedPackages) as exc:
+        Strategy(
+            authorized_licenses=[],
+            unauthorized_licenses=[],
+            authorized_packages={"valid": "1.0", "invalid": "not a spec"},
+        )
+    assert "invalid: 'not a spec'" in str(exc.value)
+    assert "valid: " not in str(exc.value).replace("invalid: ", "")
+
+
+def test_get_matched_rule():
+    strategy = Strategy(
+        authorized_licenses=["mit", "apache-2.0"],
+        unauthorized_licenses=["gpl v3"],
+        authorized_packages={"whitelisted": ""},
+    )
+    package = {"name": "whitelisted", "version": "1.0", "licenses": ["GPL v3"]}
+    assert (
+        get_matched_rule(strategy, package, Reason.OK)
+        == "authorized_packages: whitelisted"
+    )
+    package = {"name": "pkg", "version": "1.0", "licenses": ["Apache Software"]}
+    assert (
+        get_matched_rule(strategy, package, Reason.OK)
+        == "authorized_licenses: apache-2.0"
+    )
+    package = {"name": "pkg", "version": "1.0", "licenses": ["MIT", "GPL v3"]}
+    assert (
+        get_matched_rule(strategy, package, Reason.UNAUTHORIZED)
+        == "unauthorized_licenses: gpl v3"
+    )
+    assert get_matched_rule(strategy, package, Reason.UNKNOWN) is None
@@ -0,0 +1,109 @@
+import concurrent.futures
+import importlib.metadata
+
+import pytest
+
+import liccheck
+from liccheck.checker import Checker, CheckResult
+from liccheck.command_line import Level, Reason, Strategy
+
+
+@pytest.fixture
+def strategy():
+    return Strategy(
+        authorized_licenses=["bsd", "mit", "apache software", "apache-2.0"],
+        unauthorized_licenses=["gpl v3"],
+        authorized_packages={},
+    )
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    path = tmp_path.joinpath("requirements.txt")
+    path.write_text("semantic_version\npackaging\n")
+    return str(path)
+
+
+def test_lazy_public_api():
+    assert liccheck.Checker is Checker
+    assert liccheck.CheckResult is CheckResult
+    with pytest.raises(AttributeError):
+        liccheck.missing
+
+
+def test_check_requirements(strategy, requirements):
+    checker = Checker(strategy)
+    result = checker.check_requirements(requirements)
+    assert result.source == requirements
+    assert result.passed
+    assert [r.package.name for r in result.packages] == ["packaging", "semantic-version"]
+    assert result.packages[1].rule == "authorized_licenses: bsd"
+    assert result.packages[1].roots == ["semantic-version"]
+    assert result.to_dict()["packages"][1]["status"] == "OK"
+
+
+def test_check_requirements_reuses_warm_state(strategy, requirements, mocker):
+    checker = Checker(strategy)
+    checker.check_requirements(requirements)
+    read_distribution = mocker.patch("liccheck.command_line.read_distribution")
+    check_package = mocker.patch("liccheck.checker.check_package")
+    get_matched_rule = mocker.spy(liccheck.checker, "get_matched_rule")
+    result = checker.check_requirements(requirements)
+    assert result.passed
+    assert result.packages[1].rule == "authorized_licenses: bsd"
+    read_distribution.assert_not_called()
+    check_package.assert_not_called()
+    get_matched_rule.assert_not_called()
+    checker.invalidate()
+    read_distribution.side_effect = lambda dist: {
+        "name": dist.metadata["Name"],
+        "version": dist.version,
+        "location": None,
+        "dependencies": [],
+        "licenses": ["GPL v3"],
+    }
+    check_package.return_value = Reason.UNAUTHORIZED
+    result = checker.check_requirements(requirements)
+    assert not result.passed
+    assert len(result.failed) == 2
+
+
+def test_check_distributions(strategy):
+    checker = Checker(strategy, level="paranoid")
+    result = checker.check_distributions(
+        [
+            importlib.metadata.distribution("semantic_version"),
+            {"name": "gpl-lib", "version": "1.0", "licenses": ["GPL v3"],
+             "dependencies": []},
+            {"name": "app", "version": "1.0", "licenses": ["MIT"],
+             "dependencies": ["gpl-lib"]},
+        ]
+    )
+    assert [(r.package.name, r.reason) for r in result.packages] == [
+        ("app", Reason.OK),
+        ("gpl-lib", Reason.UNAUTHORIZED),
+        ("semantic-version", Reason.OK),
+    ]
+    assert result.by_reason(Reason.UNAUTHORIZED)[0].roots == ["app"]
+    assert result.by_reason(Reason.UNAUTHORIZED)[0].rule == "unauthorized_licenses: gpl v3"
+    assert checker.level is Level.PARANOID
+
+
+def test_concurrent_checks(strategy, requirements):
+    checker = Checker(strategy)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: checker.check_requirements(requirements), range(32))
+        )
+    assert all(result == results[0] for result in results)
+
+
+def test_from_strategy_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath("strategy.ini").write_text(
+        "[Licenses]\nauthorized_licenses:\n    mit\n"
+    )
+    checker = Checker.from_strategy_file("strategy.ini", level=Level.CAUTIOUS)
+    assert checker.strategy.AUTHORIZED_LICENSES == ["mit"]
+    with pytest.raises(FileNotFoundError):
+        Checker.from_strategy_file("missing.ini")
@@ -1,75 +1,135 @@
-from liccheck.command_line import parse_args, read_strategy, run, Level
-import pytest
-import sys
-import textwrap
-
-def test_parse_arguments():
-    args = parse_args([])
-    assert args.strategy_ini_file == './liccheck.ini'
-    assert args.requirement_txt_file == './requirements.txt'
-    assert args.level is Level.STANDARD
-    assert args.no_deps is False
-    args = parse_args(['--sfile', 'my_strategy.ini'])
-    assert args.strategy_ini_file == 'my_strategy.ini'
-    assert args.requirement_txt_file == './requirements.txt'
-    assert args.as_regex is False
-    assert args.level is Level.STANDARD
-    assert args.no_deps is False
-    args = parse_args(['--sfile', 'my_strategy.ini', '--rfile', 'my_requirements.txt', '--level', 'cautious'])
-    assert args.strategy_ini_file == 'my_strategy.ini'
-    assert args.requirement_txt_file == 'my_requirements.txt'
-    assert args.as_regex is False
-    assert args.level is Level.CAUTIOUS
-    assert args.no_deps is False
-    args = parse_args(['--sfile', 'my_strategy.ini', '--rfile', 'my_requirements.txt', '--level', 'cautious', '--no-deps'])
-    assert args.strategy_ini_file == 'my_strategy.ini'
-    assert args.requirement_txt_file == 'my_requirements.txt'
-    assert args.level is Level.CAUTIOUS
-    assert args.no_deps is True
-    assert args.as_regex is False
-
-    args = parse_args(["--sfile", "my_strategy.ini", "--as-regex"])
-    assert args.strategy_ini_file == "my_strategy.ini"
-    assert args.requirement_txt_file == "./requirements.txt"
-    assert args.level is Level.STANDARD
-    assert args.no_deps is False
-    assert args.as_regex is True
-
-def test_read_strategy():
-    args = parse_args(['--sfile', 'liccheck.ini'])
-    strategy = read_strategy(args.strategy_ini_file)
-    assert len(strategy.AUTHORIZED_LICENSES) > 0
-    assert len(strategy.AUTHORIZED_PACKAGES) > 0
-    assert len(strategy.UNAUTHORIZED_LICENSES) > 0
-
-
-@pytest.mark.skipif(sys.version_info[0] < 3, reason='with py2 there are more dependencies')
-def test_run(capsys):
-    args = parse_args(['--sfile', 'liccheck.ini', '--rfile', 'requirements.txt'])
-    run(args)
-    captured = capsys.readouterr().out
-    expected = textwrap.dedent(
-        '''\
-        gathering licenses...
-        3 packages and dependencies.
-        check authorized packages...
-        3 packages.
-        '''
-    )
-    assert captured == expected
-
-
-@pytest.mark.skipif(sys.version_info[0] < 3, reason='with py2 there are more dependencies')
-def test_run_without_deps(capsys):
-    args = parse_args(['--sfile', 'liccheck.ini', '--rfile', 'requirements.txt', '--no-deps'])
-    run(args)
-    captured = capsys.readouterr().out
-    expected = textwrap.dedent(
-        '''\
-        gathering licenses...
-        3 packages.
-        check authorized packages...
-        3 packages.
-        '''
-    )
-    assert captured == expected
+from liccheck.command_line import parse_args, read_strategy, requirement_files, run, Level
+import pytest
+import sys
+import textwrap
+
+def test_parse_arguments():
+    args = parse_args([])
+    assert args.strategy_ini_file == './liccheck.ini'
+    assert args.requirement_txt_file == './requirements.txt'
+    assert args.level is Level.STANDARD
+    assert args.no_deps is False
+    args = parse_args(['--sfile', 'my_strategy.ini'])
+    assert args.strategy_ini_file == 'my_strategy.ini'
+    assert args.requirement_txt_file == './requirements.txt'
+    assert args.as_regex is False
+    assert args.level is Level.STANDARD
+    assert args.no_deps is False
+    args = parse_args(['--sfile', 'my_strategy.ini', '--rfile', 'my_requirements.txt', '--level', 'cautious'])
+    assert args.strategy_ini_file == 'my_strategy.ini'
+    assert args.requirement_txt_file == 'my_requirements.txt'
+    assert args.as_regex is False
+    assert args.level is Level.CAUTIOUS
+    assert args.no_deps is False
+    args = parse_args(['--sfile', 'my_strategy.ini', '--rfile', 'my_requirements.txt', '--level', 'cautious', '--no-deps'])
+    assert args.strategy_ini_file == 'my_strategy.ini'
+    assert args.requirement_txt_file == 'my_requirements.txt'
+    assert args.level is Level.CAUTIOUS
+    assert args.no_deps is True
+    assert args.as_regex is False
+
+    args = parse_args(["--sfile", "my_strategy.ini", "--as-regex"])
+    assert args.strategy_ini_file == "my_strategy.ini"
+    assert args.requirement_txt_file == "./requirements.txt"
+    assert args.level is Level.STANDARD
+    assert args.no_deps is False
+    assert args.as_regex is True
+
+def test_read_strategy():
+    args = parse_args(['--sfile', 'liccheck.ini'])
+    strategy = read_strategy(args.strategy_ini_file)
+    assert len(strategy.AUTHORIZED_LICENSES) > 0
+    assert len(strategy.AUTHORIZED_PACKAGES) > 0
+    assert len(strategy.UNAUTHORIZED_LICENSES) > 0
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason='with py2 there are more dependencies')
+def test_run(capsys):
+    args = parse_args(['--sfile', 'liccheck.ini', '--rfile', 'requirements.txt'])
+    run(args)
+    captured = capsys.readouterr().out
+    expected = textwrap.dedent(
+        '''\
+        gathering licenses...
+        3 packages and dependencies.
+        check authorized packages...
+        3 packages.
+        '''
+    )
+    assert captured == expected
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason='with py2 there are more dependencies')
+def test_run_without_deps(capsys):
+    args = parse_args(['--sfile', 'liccheck.ini', '--rfile', 'requirements.txt', '--no-deps'])
+    run(args)
+    captured = capsys.readouterr().out
+    expected = textwrap.dedent(
+        '''\
+        gathering licenses...
+        3 packages.
+        check authorized packages...
+        3 packages.
+        '''
+    )
+    assert captured == expected
+
+
+def test_parse_dependency_path_arguments():
+    args = parse_args([])
+    assert args.max_paths is None
+    assert args.max_depth is None
+    assert args.shortest_path is False
+    args = parse_args(['--max-paths', '5', '--max-depth', '3', '--shortest-path'])
+    assert args.max_paths == 5
+    assert args.max_depth == 3
+    assert args.shortest_path is True
+    for option in ('--max-paths', '--max-depth'):
+        with pytest.raises(SystemExit):
+            parse_args([option, '-1'])
+
+
+def test_parse_jobs_argument():
+    assert parse_args([]).jobs == 1
+    assert parse_args(['--jobs', '8']).jobs == 8
+    assert parse_args(['-j', '2']).jobs == 2
+
+
+def test_parse_format_argument():
+    assert parse_args([]).report_format == "text"
+    assert parse_args(["--format", "sarif"]).report_format == "sarif"
+    with pytest.raises(SystemExit):
+        parse_args(["--format", "xml"])
+
+
+def test_parse_several_requirement_files():
+    assert parse_args(['-r', 'a.txt']).requirement_txt_file == 'a.txt'
+    args = parse_args(['-r', 'a.txt', '--rfile', 'b.txt', '-r', 'c/*.txt'])
+    assert args.requirement_txt_file == ['a.txt', 'b.txt', 'c/*.txt']
+
+
+def test_requirement_files(tmpdir):
+    tmpdir.join('b.txt').write('')
+    tmpdir.join('a.txt').write('')
+    pattern = str(tmpdir.join('*.txt'))
+    missing = str(tmpdir.join('missing*.txt'))
+    assert requirement_files('requirements.txt') == ['requirements.txt']
+    assert requirement_files(['requirements.txt', pattern, missing]) == [
+        'requirements.txt',
+        str(tmpdir.join('a.txt')),
+        str(tmpdir.join('b.txt')),
+        missing,
+    ]
+
+
+def test_run_several_requirement_files(capsys, tmpdir):
+    tmpdir.join('unknown.txt').write('python3-openid\n')
+    unknown = str(tmpdir.join('unknown.txt'))
+    args = parse_args(['--sfile', 'liccheck.ini', '-r', 'requirements.txt', '-r', unknown])
+    assert run(args) == -1
+    captured = capsys.readouterr().out
+    assert captured.startswith('==> requirements.txt <==\ngathering licenses...\n')
+    assert '==> {} <==\n'.format(unknown) in captured
+    assert captured.endswith(
+        'summary:\n    requirements.txt: passed\n    {}: failed\n'.format(unknown)
+    )
@@ -0,0 +1,100 @@
+import os
+import textwrap
+
+import pytest
+
+from liccheck import config as config_module
+from liccheck.command_line import (
+    NoValidConfigurationInPyprojectToml,
+    Strategy,
+    generate_requirements_file_from_pyproject,
+    merge_args,
+    parse_args,
+    run,
+)
+from liccheck.config import PyprojectConfig
+
+REQUIREMENTS = os.path.abspath("requirements.txt")
+
+
+@pytest.fixture
+def pyproject(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath("pyproject.toml").write_text(
+        textwrap.dedent(
+            """\
+            [project]
+            dependencies = ["semantic_version"]
+
+            [project.optional-dependencies]
+            test = ["toml"]
+
+            [tool.liccheck]
+            authorized_licenses = ["BSD", "MIT", "Apache Software", "Apache-2.0"]
+            authorized_packages = {{ uuid = "1.30" }}
+            requirement_txt_file = "{}"
+            level = "cautious"
+            """.format(REQUIREMENTS.replace("\\", "\\\\"))
+        )
+    )
+    return tmp_path
+
+
+def test_config_is_immutable(pyproject):
+    config = PyprojectConfig.load()
+    assert config.liccheck["level"] == "cautious"
+    assert config.project["dependencies"] == ("semantic_version",)
+    with pytest.raises(AttributeError):
+        config.data = {}
+    with pytest.raises(TypeError):
+        config.liccheck["level"] = "paranoid"
+
+
+def test_missing_pyproject_toml(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = PyprojectConfig.load()
+    assert config.liccheck is None
+    assert dict(config.project) == {}
+    with pytest.raises(NoValidConfigurationInPyprojectToml):
+        Strategy.from_pyproject_toml(config)
+
+
+def test_config_is_threaded(pyproject):
+    config = PyprojectConfig.load()
+    os.remove("pyproject.toml")
+    strategy = Strategy.from_pyproject_toml(config)
+    assert strategy.AUTHORIZED_PACKAGES == {"uuid": "1.30"}
+    args = dict(vars(parse_args([])), dependencies=False, optional_dependencies=[])
+    args = merge_args(args, config)
+    assert str(args["level"]) == "CAUTIOUS"
+    path = generate_requirements_file_from_pyproject(True, ["*"], config)
+    with open(path) as f:
+        assert f.read().split() == ["semantic_version", "toml"]
+
+
+def test_run_loads_pyproject_toml_once(pyproject, mocker, capsys):
+    load_toml = mocker.spy(config_module, "load_toml")
+    assert run(parse_args([])) == 0
+    assert load_toml.call_count == 1
+    assert "check authorized packages..." in capsys.readouterr().out
+
+
+def test_optional_poetry_dependencies_are_excluded(tmp_path):
+    config = PyprojectConfig(
+        str(tmp_path / "pyproject.toml"),
+        {
+            "tool": {
+                "poetry": {
+                    "dependencies": {
+                        "python": "^3.8",
+                        "toml": "*",
+                        "semantic_version": {"version": "^2.0"},
+                        "optdep": {"version": "^1.0", "optional": True},
+                    }
+                }
+            }
+        },
+    )
+    path = generate_requirements_file_from_pyproject(True, [], config)
+    with open(path) as f:
+        assert f.read().split() == ["semantic_version", "toml"]
@@ -3,7 +3,14 @@ import sys
 import pkg_resources
 import pytest
 
+from liccheck import command_line, metadata
 from liccheck.command_line import get_packages_info
+from liccheck.requirements import (
+    BACKENDS,
+    DistributionIndex,
+    DistributionNotFound,
+    VersionConflict,
+)
 
 
 def test_license_strip(tmpfile):
@@ -60,21 +67,49 @@ def test_editable_requirements_get_ignored(tmpfile):
     ('no_deps', 'expected_packages'), (
         pytest.param(
             False,
-            ('liccheck', 'semantic-version', 'toml'),
+            ('liccheck', 'packaging', 'semantic-version', 'toml'),
             id='with deps'
         ),
         pytest.param(True, ('liccheck',), id='without deps'),
     )
 )
-def test_deps(tmpfile, no_deps, expected_packages):
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_deps(tmpfile, no_deps, expected_packages, backend):
     tmpfh, tmppath = tmpfile
     tmpfh.write('liccheck\n')
     tmpfh.close()
-    packages_info = get_packages_info(tmppath, no_deps)
+    packages_info = get_packages_info(tmppath, no_deps, backend)
     packages = tuple(package['name'] for package in packages_info)
     assert packages == expected_packages
 
 
+def test_jobs_keep_results_identical(tmpfile):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write('liccheck\npip\n')
+    tmpfh.close()
+    assert get_packages_info(tmppath, jobs=4) == get_packages_info(tmppath)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('no_deps', (False, True))
+def test_missing_distribution(tmpfile, no_deps, backend):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write('liccheck-missing-distribution\n')
+    tmpfh.close()
+    with pytest.raises(DistributionNotFound):
+        get_packages_info(tmppath, no_deps, backend)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('no_deps', (False, True))
+def test_version_conflict(tmpfile, no_deps, backend):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write('pip<1\n')
+    tmpfh.close()
+    with pytest.raises(VersionConflict):
+        get_packages_info(tmppath, no_deps, backend)
+
+
 def test_license_expression(tmp_path, mocker):
     resolve = mocker.patch("liccheck.command_line.resolve")
     req_path = tmp_path.joinpath("requirements.txt").as_posix()
@@ -91,3 +126,61 @@ def test_license_expression(tmp_path, mocker):
         pkg_resources.Distribution(project_name="Twisted", metadata=metadata)
     ]
     assert get_packages_info(req_path)[0]["licenses"] == ["MIT"]
+
+
+def test_duplicates_are_removed(tmp_path, mocker):
+    resolve = mocker.patch("liccheck.command_line.resolve")
+    req_path = tmp_path.joinpath("requirements.txt").as_posix()
+    with open(req_path, "w") as tmpfh:
+        tmpfh.write("Twisted\n")
+    pkg_info_path = tmp_path.joinpath("PKG-INFO").as_posix()
+    with open(pkg_info_path, "w") as tmpfh:
+        tmpfh.write("Metadata-Version: 2.1\n")
+        tmpfh.write("Name: Twisted\n")
+        tmpfh.write("Version: 23.8.0\n")
+        tmpfh.write("License: MIT\n")
+    metadata = pkg_resources.FileMetadata(pkg_info_path)
+    resolve.return_value = [
+        pkg_resources.Distribution(project_name="Twisted", version="23.8.0", metadata=metadata),
+        pkg_resources.Distribution(project_name="twisted", version="23.8.0", metadata=metadata),
+        pkg_resources.Distribution(project_name="Twisted", version="23.10.0", metadata=metadata),
+    ]
+    packages = get_packages_info(req_path)
+    assert [(p["name"], p["version"]) for p in packages] == [
+        ("Twisted", "23.8.0"), ("Twisted", "23.10.0")]
+
+
+def test_shared_index_and_memo(tmpfile, mocker):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("semantic_version\n")
+    tmpfh.close()
+    read_distribution = mocker.spy(command_line, "read_distribution")
+    index = DistributionIndex()
+    memo = {}
+    first = get_packages_info(tmppath, index=index, memo=memo)
+    second = get_packages_info(tmppath, index=index, memo=memo)
+    assert first == second
+    assert read_distribution.call_count == 1
+    assert list(memo.values()) == first
+
+
+def test_metadata_is_read_once_per_distribution(tmp_path, mocker):
+    for name, requires in (
+        ("foo", ["bar", "baz; extra == 'extra'"]),
+        ("bar", ["baz"]),
+        ("baz", []),
+    ):
+        dist_info = tmp_path.joinpath("{}-1.0.dist-info".format(name))
+        dist_info.mkdir()
+        dist_info.joinpath("METADATA").write_text(
+            "Name: {}\nVersion: 1.0\nLicense: MIT\n".format(name)
+            + "".join("Requires-Dist: {}\n".format(r) for r in requires)
+        )
+    req_path = tmp_path.joinpath("requirements.txt")
+    req_path.write_text("foo[extra]\n")
+    read_headers = mocker.spy(metadata, "_read_importlib_headers")
+    index = DistributionIndex(paths=[str(tmp_path)])
+    packages = get_packages_info(str(req_path), index=index)
+    assert [p.name for p in packages] == ["bar", "baz", "foo"]
+    assert packages[2].dependencies == ("bar",)
+    assert read_headers.call_count == 3
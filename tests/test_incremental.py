@@ -0,0 +1,130 @@
+from liccheck import metadata
+from liccheck.cache import MetadataCache
+from liccheck.command_line import Level, Reason, Strategy, get_packages_info, process
+from liccheck.requirements import DistributionIndex
+from liccheck.incremental import IncrementalState, strategy_fingerprint
+from liccheck.metadata import METADATA_VERSION
+
+
+def make_strategy(authorized_licenses):
+    return Strategy(
+        authorized_licenses=authorized_licenses,
+        unauthorized_licenses=[],
+        authorized_packages={},
+    )
+
+
+def test_strategy_fingerprint():
+    strategy = make_strategy(["mit"])
+    fingerprint = strategy_fingerprint(strategy, Level.STANDARD)
+    assert fingerprint == strategy_fingerprint(make_strategy(["mit"]), Level.STANDARD)
+    assert fingerprint != strategy_fingerprint(strategy, Level.PARANOID)
+    assert fingerprint != strategy_fingerprint(make_strategy(["bsd"]), Level.STANDARD)
+
+
+def test_process_reuses_previous_verdicts(tmp_path, tmpfile, mocker):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("pip\n")
+    tmpfh.close()
+    state_file = str(tmp_path.joinpath("state.json"))
+    strategy = make_strategy(["mit"])
+    fingerprint = strategy_fingerprint(strategy, Level.STANDARD)
+
+    state = IncrementalState(state_file, fingerprint)
+    assert process(tmppath, strategy, no_deps=True, state=state) == 0
+    assert state.rechecked == 1
+    state.save()
+
+    check_package = mocker.patch("liccheck.command_line.check_package")
+    read_distribution = mocker.patch("liccheck.command_line.read_distribution")
+    state = IncrementalState(state_file, fingerprint)
+    assert process(tmppath, strategy, no_deps=True, state=state) == 0
+    assert state.rechecked == 0
+    check_package.assert_not_called()
+    read_distribution.assert_not_called()
+
+    check_package.return_value = Reason.UNKNOWN
+    state = IncrementalState(state_file, strategy_fingerprint(strategy, Level.PARANOID))
+    assert process(tmppath, strategy, Level.PARANOID, no_deps=True, state=state) == -1
+    assert state.rechecked == 1
+    read_distribution.assert_not_called()
+
+
+def test_process_counts_rechecked_packages_per_file(tmp_path, capsys):
+    first = tmp_path.joinpath("first.txt")
+    first.write_text("pip\n")
+    second = tmp_path.joinpath("second.txt")
+    second.write_text("pytest\n")
+    strategy = make_strategy(["mit"])
+    state = IncrementalState(
+        str(tmp_path.joinpath("state.json")), strategy_fingerprint(strategy, Level.STANDARD)
+    )
+    process(str(first), strategy, no_deps=True, state=state)
+    process(str(second), strategy, no_deps=True, state=state)
+    out = capsys.readouterr().out
+    assert out.count("1 package checked since the last run.") == 2
+    assert state.rechecked == 2
+
+
+def test_state_of_another_version_is_ignored(tmp_path, mocker):
+    state_file = str(tmp_path.joinpath("state.json"))
+    fingerprint = strategy_fingerprint(make_strategy(["mit"]), Level.STANDARD)
+    state = IncrementalState(state_file, fingerprint)
+    state.put("key", {"name": "pip"})
+    state.verdicts["pip|1.0|MIT"] = "OK"
+    state.save()
+    assert IncrementalState(state_file, fingerprint).get("key") == {"name": "pip"}
+
+    mocker.patch("liccheck.incremental.MATCHING_VERSION", 2)
+    assert strategy_fingerprint(make_strategy(["mit"]), Level.STANDARD) != fingerprint
+    mocker.patch("liccheck.incremental.METADATA_VERSION", METADATA_VERSION + 1)
+    state = IncrementalState(
+        state_file, strategy_fingerprint(make_strategy(["mit"]), Level.STANDARD)
+    )
+    assert state.get("key") is None
+    assert state.previous_verdicts == {}
+
+
+def test_state_fills_the_metadata_cache(tmp_path, tmpfile):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("pip\n")
+    tmpfh.close()
+    state_file = str(tmp_path.joinpath("state.json"))
+    strategy = make_strategy(["mit"])
+    fingerprint = strategy_fingerprint(strategy, Level.STANDARD)
+    state = IncrementalState(state_file, fingerprint)
+    process(tmppath, strategy, no_deps=True, state=state)
+    state.save()
+
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    state = IncrementalState(state_file, fingerprint, cache)
+    process(tmppath, strategy, no_deps=True, state=state)
+    cache.save()
+    cache = MetadataCache(str(tmp_path.joinpath("cache")))
+    assert len(get_packages_info(tmppath, no_deps=True, cache=cache)) == 1
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_unchanged_distributions_are_not_read_again(tmp_path, mocker):
+    site_packages = tmp_path.joinpath("site-packages")
+    site_packages.mkdir()
+    for name, requires in (("foo", ["bar"]), ("bar", [])):
+        dist_info = site_packages.joinpath("{}-1.0.dist-info".format(name))
+        dist_info.mkdir()
+        dist_info.joinpath("METADATA").write_text(
+            "Name: {}\nVersion: 1.0\nLicense: MIT\n".format(name)
+            + "".join("Requires-Dist: {}\n".format(r) for r in requires)
+        )
+    req_path = str(tmp_path.joinpath("requirements.txt"))
+    tmp_path.joinpath("requirements.txt").write_text("foo\n")
+    state_file = str(tmp_path.joinpath("state.json"))
+    strategy = make_strategy(["mit"])
+    fingerprint = strategy_fingerprint(strategy, Level.STANDARD)
+    for reads in (2, 0):
+        read_headers = mocker.spy(metadata, "_read_importlib_headers")
+        state = IncrementalState(state_file, fingerprint)
+        index = DistributionIndex(paths=[str(site_packages)])
+        assert process(req_path, strategy, state=state, index=index) == 0
+        state.save()
+        assert read_headers.call_count == reads
+        mocker.stopall()
@@ -0,0 +1,166 @@
+import importlib.metadata
+import textwrap
+
+import pytest
+
+from liccheck.command_line import Level, Reason, Strategy, check_package, get_packages_info
+from liccheck.lockfile import LockedPackage, lockfile_reader, read_lockfile, read_pylock
+
+SEMANTIC_VERSION = importlib.metadata.version("semantic_version")
+
+LOCKFILES = {
+    "poetry.lock": """\
+        [[package]]
+        name = "semantic-version"
+        version = "{version}"
+        description = "A library implementing the 'SemVer' scheme."
+        optional = false
+        python-versions = ">=2.7"
+        files = []
+
+        [package.dependencies]
+        missing-lib = ">=1.0"
+        colorama = {{version = "*", markers = "sys_platform == 'never'"}}
+        extra-lib = {{version = "*", optional = true}}
+
+        [[package]]
+        name = "missing-lib"
+        version = "1.0"
+        optional = false
+        python-versions = "*"
+        files = []
+
+        [[package]]
+        name = "colorama"
+        version = "0.4.6"
+        optional = false
+        python-versions = "*"
+        markers = "sys_platform == 'never'"
+        files = []
+
+        [[package]]
+        name = "extra-lib"
+        version = "2.0"
+        description = "Only installed with an extra."
+        optional = true
+        python-versions = "*"
+        files = []
+
+        [metadata]
+        lock-version = "2.1"
+        """,
+    "pdm.lock": """\
+        [metadata]
+        lock_version = "4.4"
+
+        [[package]]
+        name = "semantic-version"
+        version = "{version}"
+        dependencies = [
+            "missing-lib>=1.0",
+            "colorama; sys_platform == 'never'",
+            "extra-lib; extra == 'docs'",
+        ]
+
+        [[package]]
+        name = "missing-lib"
+        version = "1.0"
+
+        [[package]]
+        name = "colorama"
+        version = "0.4.6"
+        marker = "sys_platform == 'never'"
+        """,
+    "uv.lock": """\
+        version = 1
+        requires-python = ">=3.8"
+
+        [[package]]
+        name = "my-project"
+        version = "0.1.0"
+        source = {{ editable = "." }}
+        dependencies = [{{ name = "semantic-version" }}]
+
+        [[package]]
+        name = "semantic-version"
+        version = "{version}"
+        source = {{ registry = "https://pypi.org/simple" }}
+        dependencies = [
+            {{ name = "missing-lib" }},
+            {{ name = "colorama", marker = "sys_platform == 'never'" }},
+        ]
+
+        [package.optional-dependencies]
+        docs = [{{ name = "extra-lib" }}]
+
+        [[package]]
+        name = "missing-lib"
+        version = "1.0"
+        source = {{ registry = "https://pypi.org/simple" }}
+        """,
+    "pylock.toml": """\
+        lock-version = "1.0"
+        created-by = "pip"
+
+        [[packages]]
+        name = "semantic-version"
+        version = "{version}"
+        dependencies = [
+            {{ name = "missing-lib" }},
+            {{ name = "colorama", marker = "sys_platform == 'never'" }},
+        ]
+
+        [[packages]]
+        name = "missing-lib"
+        version = "1.0"
+
+        [[packages]]
+        name = "colorama"
+        version = "0.4.6"
+        marker = "sys_platform == 'never'"
+        """,
+}
+
+
+@pytest.fixture(params=sorted(LOCKFILES))
+def lockfile(request, tmp_path):
+    path = tmp_path.joinpath(request.param)
+    path.write_text(
+        textwrap.dedent(LOCKFILES[request.param]).format(version=SEMANTIC_VERSION)
+    )
+    return str(path)
+
+
+def test_lockfile_reader():
+    assert lockfile_reader("path/to/pylock.dev.toml") is read_pylock
+    assert lockfile_reader("requirements.txt") is None
+    assert read_lockfile("requirements.txt") is None
+
+
+def test_read_lockfile(lockfile):
+    assert read_lockfile(lockfile) == [
+        LockedPackage("semantic-version", SEMANTIC_VERSION, ["missing-lib"]),
+        LockedPackage("missing-lib", "1.0", []),
+    ]
+
+
+def test_get_packages_info_from_lockfile(lockfile):
+    missing, installed = get_packages_info(lockfile)
+    assert installed.name == "semantic-version"
+    assert installed.licenses == ("BSD",)
+    assert installed.dependencies == ("missing-lib",)
+    assert installed.location is not None
+    assert missing.key == ("missing-lib", "1.0", None)
+    assert missing.licenses == ()
+
+    strategy = Strategy(["bsd"], [], {})
+    assert check_package(strategy, installed, Level.STANDARD) is Reason.OK
+    assert check_package(strategy, missing, Level.STANDARD) is Reason.UNKNOWN
+
+
+def test_locked_version_not_installed(tmp_path):
+    path = tmp_path.joinpath("pdm.lock")
+    path.write_text('[[package]]\nname = "semantic-version"\nversion = "0.0.1"\n')
+    (package,) = get_packages_info(str(path))
+    assert package.version == "0.0.1"
+    assert package.licenses == ()
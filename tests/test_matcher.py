@@ -0,0 +1,41 @@
+import re
+
+import pytest
+
+from liccheck.matcher import (
+    classify_with_regex,
+    compile_combined_regex,
+    rules_pattern,
+    trie_pattern,
+)
+
+
+def test_trie_pattern():
+    assert trie_pattern(["mit", "mit license", "mpl"]) == r"m(?:it(?:\ license)?|pl)"
+    assert trie_pattern(["bsd"]) == "bsd"
+
+
+@pytest.mark.parametrize(
+    ("authorized", "unauthorized"),
+    [
+        (["mit", "mit license", "bsd", r"\bapache"], [r"\bgpl", "agpl", "gpl v3"]),
+        (["mit"], []),
+        ([], [r"\bgpl"]),
+    ],
+)
+@pytest.mark.parametrize(
+    "license",
+    ["mit", "mit license", "gnu gpl v3", "lgpl", "apache 2.0", "agpl and bsd", "isc", ""],
+)
+def test_combined_regex_matches_separate_regexes(authorized, unauthorized, license):
+    combined = compile_combined_regex(authorized, unauthorized)
+    expected = tuple(
+        bool(rules) and re.search("|".join(rules), license) is not None
+        for rules in (authorized, unauthorized)
+    )
+    assert classify_with_regex(combined, license) == expected
+    assert re.search(rules_pattern(authorized), license) is not None or not expected[0]
+
+
+def test_conflicting_groups_are_not_combined():
+    assert compile_combined_regex(["(?P<x>mit)"], ["(?P<x>gpl)"]) is None
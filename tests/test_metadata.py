@@ -0,0 +1,44 @@
+import pytest
+
+from liccheck.metadata import parse_headers, parse_license_headers
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        (["License: MIT"], ["MIT"]),
+        (["License: UNKNOWN", "Classifier: License :: OSI Approved :: MIT License"], ["MIT License"]),
+        (["License: GPL", "License-Expression: MIT OR Apache-2.0"], ["MIT OR Apache-2.0"]),
+        (
+            [
+                "Classifier: License :: OSI Approved",
+                "Classifier: License :: OSI Approved :: BSD License",
+                "Classifier: License :: Public Domain",
+                "Classifier: Programming Language :: Python",
+            ],
+            ["BSD License", "Public Domain"],
+        ),
+        (["License: BSD", "        Copyright (c) someone", "        All rights reserved."], ["BSD"]),
+        (["Name: example"], []),
+    ],
+)
+def test_parse_license_headers(headers, expected):
+    lines = ["Metadata-Version: 2.1\r\n"] + [h + "\r\n" for h in headers]
+    assert parse_license_headers(lines) == expected
+
+
+def test_parse_license_headers_stops_at_description():
+    lines = [
+        "Metadata-Version: 2.1\n",
+        "Name: example\n",
+        "\n",
+        "License: GPL\n",
+        "Classifier: License :: OSI Approved :: GNU General Public License (GPL)\n",
+    ]
+    assert parse_license_headers(lines) == []
+
+
+def test_parse_headers_size():
+    lines = ["Name: \u00e9\r\n", "\n", "Long description\n"]
+    # the header block, newlines counted as one byte
+    assert parse_headers(lines).size == len("Name: \u00e9\n\n".encode("utf-8"))
@@ -0,0 +1,56 @@
+import pickle
+
+import pytest
+
+from liccheck.package_info import PackageInfo
+
+
+@pytest.fixture
+def package():
+    return PackageInfo(
+        name="Foo_Bar",
+        version="1.0",
+        location="path",
+        dependencies=["baz"],
+        licenses=["MIT", "BSD", "MIT"],
+    )
+
+
+def test_fields(package):
+    assert package.licenses == ("BSD", "MIT")
+    assert package.dependencies == ("baz",)
+    assert package.key == ("foo-bar", "1.0", "path")
+    assert package.parsed_version.major == 1
+    assert package.parsed_version is package.parsed_version
+    assert PackageInfo("legacy", "not a version").parsed_version is None
+
+
+def test_dict_compatibility(package):
+    assert package["name"] == "Foo_Bar"
+    assert package["licenses"] == ["BSD", "MIT"]
+    assert package.get("missing") is None
+    with pytest.raises(KeyError):
+        package["missing"]
+    assert dict(package) == package.to_dict()
+    assert PackageInfo.from_dict(package.to_dict()) == package
+    assert PackageInfo.coerce(package) is package
+
+
+def test_immutable_and_hashable(package):
+    with pytest.raises(AttributeError):
+        package.name = "other"
+    same = PackageInfo("Foo_Bar", "1.0", "path", ["baz"], ["BSD", "MIT"])
+    assert len({package, same}) == 1
+    assert not hasattr(package, "__dict__")
+
+
+def test_pickle(package):
+    assert pickle.loads(pickle.dumps(package)) == package
+
+
+def test_requires_dist_is_kept_but_not_compared():
+    package = PackageInfo("foo", "1.0", requires_dist=["bar; extra == 'x'"])
+    assert package.requires_dist == ("bar; extra == 'x'",)
+    assert package == PackageInfo("foo", "1.0")
+    assert "requires_dist" not in package.to_dict()
+    assert pickle.loads(pickle.dumps(package)).requires_dist == package.requires_dist
@@ -164,3 +164,18 @@ class TestReadStrategy:
             "liccheck.command_line.Strategy.from_pyproject_toml",
             side_effect=NoValidConfigurationInPyprojectToml
         )
+
+
+class TestInvalidStrategy:
+    def test_displays_error_if_authorized_packages_are_invalid(self, tmpfile, capsys):
+        tmpfh, tmppath = tmpfile
+        tmpfh.write("""
+[Licenses]
+[Authorized Packages]
+uuid: not a spec
+""")
+        tmpfh.close()
+        with pytest.raises(SystemExit) as exc:
+            read_strategy(strategy_file=tmppath)
+        assert exc.value.code == 1
+        assert "uuid: 'not a spec'" in capsys.readouterr().out
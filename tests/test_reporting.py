@@ -0,0 +1,168 @@
+import csv
+import io
+import json
+
+import pytest
+
+from liccheck.command_line import Level, Strategy, build_reverse_dependencies, process
+from liccheck.package_info import PackageInfo
+from liccheck.reporting import FORMATS, WRITERS, DependencyRoots
+
+
+@pytest.fixture
+def packages():
+    return [
+        PackageInfo("app", "1.0", "path", ["Lib-A", "lib_b"], ["MIT"]),
+        PackageInfo("lib-a", "2.0", "path", ["shared"], ["GPL v3"]),
+        PackageInfo("lib-b", "3.0", "path", ["shared"], []),
+        PackageInfo("shared", "4.0", "path", [], ["Apache Software", "MIT"]),
+    ]
+
+
+@pytest.fixture
+def strategy():
+    return Strategy(
+        authorized_licenses=["mit", "apache-2.0"],
+        unauthorized_licenses=["gpl v3"],
+        authorized_packages={},
+    )
+
+
+def records(packages):
+    return [
+        {
+            "name": package.name,
+            "version": package.version,
+            "licenses": list(package.licenses),
+            "status": "OK",
+            "rule": None,
+            "roots": ["app"],
+        }
+        for package in packages
+    ]
+
+
+def write(report_format, records, source=None):
+    f = io.StringIO()
+    writer = WRITERS[report_format](f, source=source)
+    writer.begin()
+    for record in records:
+        writer.write(record)
+    writer.end()
+    return f.getvalue()
+
+
+def test_dependency_roots(packages):
+    roots = DependencyRoots(build_reverse_dependencies(packages))
+    assert roots.get("shared") == ["app"]
+    assert roots.get("lib-a") == ["app"]
+    assert roots.get("app") == ["app"]
+
+
+def test_dependency_roots_with_several_roots():
+    packages = [
+        PackageInfo("a", "1", dependencies=["c"]),
+        PackageInfo("b", "1", dependencies=["c"]),
+        PackageInfo("c", "1"),
+    ]
+    assert DependencyRoots(build_reverse_dependencies(packages)).get("c") == ["a", "b"]
+
+
+def test_dependency_roots_with_cycles():
+    packages = [
+        PackageInfo("root", "1", dependencies=["a"]),
+        PackageInfo("a", "1", dependencies=["b"]),
+        PackageInfo("b", "1", dependencies=["a", "c"]),
+        PackageInfo("c", "1"),
+        PackageInfo("x", "1", dependencies=["y"]),
+        PackageInfo("y", "1", dependencies=["x"]),
+    ]
+    roots = DependencyRoots(build_reverse_dependencies(packages))
+    assert roots.get("c") == ["root"]
+    assert roots.get("b") == ["root"]
+    assert roots.get("a") == ["root"]
+    assert roots.get("x") == []
+
+
+def test_jsonl_writer(packages):
+    output = write("jsonl", records(packages))
+    assert [json.loads(line) for line in output.splitlines()] == records(packages)
+
+
+@pytest.mark.parametrize("count", [0, 1, 4])
+def test_json_writer(packages, count):
+    assert json.loads(write("json", records(packages[:count]))) == records(
+        packages[:count]
+    )
+
+
+def test_csv_writer_keeps_licenses_with_spaces(packages):
+    rows = list(csv.DictReader(io.StringIO(write("csv", records(packages)))))
+    assert len(rows) == 4
+    assert rows[3]["name"] == "shared"
+    assert rows[3]["licenses"] == "Apache Software; MIT"
+    assert rows[3]["roots"] == "app"
+
+
+def test_sarif_writer_reports_non_compliant_packages(packages):
+    report = records(packages)
+    report[1]["status"] = "UNAUTHORIZED"
+    report[2]["status"] = "UNKNOWN"
+    log = json.loads(write("sarif", report, source="requirements.txt"))
+    assert log["version"] == "2.1.0"
+    results = log["runs"][0]["results"]
+    assert [r["ruleId"] for r in results] == [
+        "liccheck/unauthorized",
+        "liccheck/unknown",
+    ]
+    assert results[0]["locations"][0]["logicalLocations"][0]["name"] == "lib-a"
+    assert results[0]["properties"]["licenses"] == ["GPL v3"]
+
+
+def test_sarif_writer_without_results():
+    log = json.loads(write("sarif", []))
+    assert log["runs"][0]["results"] == []
+    assert log["runs"][0]["tool"]["driver"]["name"] == "liccheck"
+
+
+@pytest.mark.parametrize("report_format", FORMATS)
+def test_process_writes_report(
+    mocker, tmpdir, capsys, packages, strategy, report_format
+):
+    mocker.patch("liccheck.command_line.get_packages_info", return_value=packages)
+    reporting_file = str(tmpdir.join("report"))
+    process(
+        "requirements.txt",
+        strategy,
+        Level.CAUTIOUS,
+        reporting_file,
+        report_format=report_format,
+    )
+    with open(reporting_file) as f:
+        report = f.read()
+    assert "lib-a" in report
+    if report_format == "jsonl":
+        by_name = {r["name"]: r for r in map(json.loads, report.splitlines())}
+        assert by_name["app"]["rule"] == "authorized_licenses: mit"
+        assert by_name["lib-a"]["status"] == "UNAUTHORIZED"
+        assert by_name["lib-a"]["rule"] == "unauthorized_licenses: gpl v3"
+        assert by_name["lib-b"]["status"] == "UNKNOWN"
+        assert by_name["lib-b"]["rule"] is None
+        assert by_name["shared"]["licenses"] == ["Apache Software", "MIT"]
+        assert by_name["shared"]["rule"] == "authorized_licenses: apache-2.0"
+        assert by_name["shared"]["roots"] == ["app"]
+
+
+def test_process_writes_text_report(mocker, tmpdir, capsys, packages, strategy):
+    mocker.patch("liccheck.command_line.get_packages_info", return_value=packages)
+    get_matched_rule = mocker.patch("liccheck.command_line.get_matched_rule")
+    reporting_file = str(tmpdir.join("report.txt"))
+    process("requirements.txt", strategy, Level.STANDARD, reporting_file)
+    get_matched_rule.assert_not_called()
+    with open(reporting_file) as f:
+        assert f.read() == (
+            "app 1.0 MIT OK\n"
+            "lib-a 2.0 GPL v3 UNAUTHORIZED\n"
+            "lib-b 3.0 UNKNOWN UNKNOWN\n"
+            "shared 4.0 Apache Software OK\n"
+        )
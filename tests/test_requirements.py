@@ -0,0 +1,123 @@
+import textwrap
+
+import pytest
+from packaging.requirements import Requirement
+
+from liccheck.requirements import (
+    DistributionIndex,
+    RequirementsFileError,
+    VersionConflict,
+    iter_logical_lines,
+    parse_requirements,
+    resolve,
+    resolve_without_deps,
+)
+
+
+def make_dist_info(site_packages, name, version, requires=()):
+    dist_info = site_packages.joinpath(
+        "{}-{}.dist-info".format(name.replace("-", "_"), version)
+    )
+    dist_info.mkdir()
+    with open(str(dist_info.joinpath("METADATA")), "w") as f:
+        f.write("Metadata-Version: 2.1\n")
+        f.write("Name: {}\n".format(name))
+        f.write("Version: {}\n".format(version))
+        for requirement in requires:
+            f.write("Requires-Dist: {}\n".format(requirement))
+
+
+@pytest.fixture
+def index(tmp_path):
+    make_dist_info(tmp_path, "Foo-Bar", "1.0", ["baz>=2", "qux; extra == 'extra'"])
+    make_dist_info(tmp_path, "baz", "2.1")
+    make_dist_info(tmp_path, "qux", "0.1")
+    return DistributionIndex(paths=[str(tmp_path)])
+
+
+def test_index_lookup_uses_normalized_names(index):
+    assert len(index) == 3
+    assert index.get("foo_bar") is index.get("FOO.BAR")
+    assert index.get("foo-bar").metadata["Name"] == "Foo-Bar"
+    assert index.get("missing") is None
+
+
+def test_resolve_without_deps_with_index(index):
+    requirements = [Requirement("foo-bar==1.0"), Requirement("qux")]
+    dists = list(resolve_without_deps(requirements, index=index))
+    assert [dist.metadata["Name"] for dist in dists] == ["Foo-Bar", "qux"]
+
+
+def test_resolve_with_index(index):
+    dists = list(resolve([Requirement("foo-bar")], index=index))
+    assert [dist.metadata["Name"] for dist in dists] == ["Foo-Bar", "baz"]
+    dists = list(resolve([Requirement("foo-bar[extra]")], index=index))
+    assert [dist.metadata["Name"] for dist in dists] == ["Foo-Bar", "baz", "qux"]
+
+
+def test_resolve_version_conflict(index):
+    with pytest.raises(VersionConflict):
+        list(resolve_without_deps([Requirement("baz<2")], index=index))
+
+
+def write(path, content):
+    path.write_text(textwrap.dedent(content))
+    return str(path)
+
+
+def test_parse_requirements_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("LIB_VERSION", "2.0")
+    write(
+        tmp_path.joinpath("base.txt"),
+        """\
+        baz>=1  # trailing comment
+        -r requirements.txt # included twice, only read once
+        """,
+    )
+    write(tmp_path.joinpath("constraints.txt"), "qux<1\n")
+    path = write(
+        tmp_path.joinpath("requirements.txt"),
+        """\
+        # comment
+        --index-url https://example.com/simple
+        --pre
+        -r base.txt
+        -c constraints.txt
+        -e git+https://example.com/editable.git#egg=editable
+        --editable=./local
+        foo[extra]==1.0 \\
+            --hash=sha256:0123 \\
+            --hash=sha256:4567
+        bar==${LIB_VERSION}; python_version >= "3"
+        never; python_version < "3"
+        git+https://example.com/repo.git@main#egg=from-git
+        ./wheels/from_wheel-3.0-py3-none-any.whl
+        named @ https://example.com/named-1.0.tar.gz
+        """,
+    )
+    requirements = parse_requirements(path)
+    assert [r.name for r in requirements] == [
+        "baz",
+        "foo",
+        "bar",
+        "from-git",
+        "from_wheel",
+        "named",
+    ]
+    assert str(requirements[1]) == "foo[extra]==1.0"
+    assert str(requirements[2].specifier) == "==2.0"
+    assert str(requirements[4].specifier) == "==3.0"
+    assert requirements[5].url == "https://example.com/named-1.0.tar.gz"
+
+
+def test_parse_requirements_error_location(tmp_path):
+    path = write(tmp_path.joinpath("requirements.txt"), "valid\n\nnot valid!\n")
+    with pytest.raises(RequirementsFileError) as excinfo:
+        parse_requirements(path)
+    assert excinfo.value.line_number == 3
+    assert str(excinfo.value).startswith(path + ":3: ")
+
+
+def test_logical_lines():
+    lines = ["a \\\n", "  b\n", "# comment\n", "\n", "c # comment \\\n", "d \\"]
+    assert list(iter_logical_lines(lines)) == [(1, "a   b"), (5, "c"), (6, "d")]
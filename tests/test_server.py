@@ -0,0 +1,181 @@
+import os
+import shutil
+import stat
+import threading
+import time
+
+import pytest
+
+from liccheck import client
+from liccheck.cache import MemoryCache
+from liccheck.checker import Checker
+from liccheck.command_line import Strategy, parse_args
+from liccheck.server import LicenseServer, UnixSocketServer, Watcher
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "getuid"), reason="Unix sockets are needed"
+)
+
+STRATEGY = "[Licenses]\nauthorized_licenses:\n    mit\nunauthorized_licenses:\n    gpl v3\n"
+
+
+def install(site_packages, name, version, license):
+    dist_info = site_packages.joinpath("{}-{}.dist-info".format(name, version))
+    dist_info.mkdir()
+    dist_info.joinpath("METADATA").write_text(
+        "Metadata-Version: 2.1\nName: {}\nVersion: {}\nLicense: {}\n".format(
+            name, version, license
+        )
+    )
+    return dist_info
+
+
+def touch_later(path):
+    # the next modification time, even on file systems with a coarse one
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def env(tmp_path):
+    site_packages = tmp_path.joinpath("site-packages")
+    site_packages.mkdir()
+    install(site_packages, "alpha", "1.0", "MIT")
+    requirements = tmp_path.joinpath("requirements.txt")
+    requirements.write_text("alpha\n")
+    strategy = tmp_path.joinpath("strategy.ini")
+    strategy.write_text(STRATEGY)
+    return site_packages, requirements, strategy
+
+
+@pytest.fixture
+def license_server(env):
+    site_packages, _, strategy = env
+    cache = MemoryCache()
+
+    def load_checker():
+        return Checker(
+            Strategy.from_config(str(strategy)), paths=[str(site_packages)], cache=cache
+        )
+
+    return LicenseServer(load_checker, [str(strategy)], [str(site_packages)])
+
+
+def test_watcher(tmp_path):
+    path = tmp_path.joinpath("file")
+    watcher = Watcher([str(path)])
+    assert watcher.changed() == []
+    path.write_text("")
+    assert watcher.changed() == [str(path)]
+    assert watcher.changed() == []
+
+
+def test_check_results_are_kept(license_server, env, mocker):
+    _, requirements, _ = env
+    result = license_server.check(str(requirements))
+    assert result["passed"]
+    assert [p["name"] for p in result["packages"]] == ["alpha"]
+    check_requirements = mocker.spy(Checker, "check_requirements")
+    assert license_server.check(str(requirements)) is result
+    check_requirements.assert_not_called()
+
+
+def test_requirement_file_change(license_server, env):
+    site_packages, requirements, _ = env
+    install(site_packages, "beta", "1.0", "GPL v3")
+    license_server.environment.changed()  # not the change tested here
+    license_server.check(str(requirements))
+    requirements.write_text("alpha\nbeta\n")
+    touch_later(requirements)
+    license_server.poll()
+    result = license_server.check(str(requirements))
+    assert not result["passed"]
+    assert [p["status"] for p in result["packages"]] == ["OK", "UNAUTHORIZED"]
+
+
+def test_environment_change_rereads_changed_distributions(license_server, env):
+    site_packages, requirements, _ = env
+    beta = install(site_packages, "beta", "1.0", "MIT")
+    requirements.write_text("alpha\nbeta\n")
+    license_server.environment.changed()
+    result = license_server.check(str(requirements))
+    assert [p["status"] for p in result["packages"]] == ["OK", "OK"]
+    shutil.rmtree(str(beta))
+    install(site_packages, "beta", "2.0", "GPL v3")
+    touch_later(site_packages)
+    cache = license_server.checker.cache
+    misses = cache.misses
+    license_server.poll()
+    result = license_server.check(str(requirements))
+    assert [p["version"] for p in result["packages"]] == ["1.0", "2.0"]
+    assert [p["status"] for p in result["packages"]] == ["OK", "UNAUTHORIZED"]
+    # alpha comes from the cache, only beta is read again
+    assert cache.misses == misses + 1
+
+
+def test_strategy_change(license_server, env):
+    site_packages, requirements, strategy = env
+    install(site_packages, "beta", "1.0", "GPL v3")
+    requirements.write_text("beta\n")
+    assert not license_server.check(str(requirements))["passed"]
+    strategy.write_text("[Licenses]\nauthorized_licenses:\n    gpl v3\n")
+    touch_later(strategy)
+    license_server.poll()
+    assert license_server.check(str(requirements))["passed"]
+
+
+def test_invalid_strategy_keeps_checker(license_server, env):
+    _, _, strategy = env
+    checker = license_server.checker
+    strategy.unlink()
+    license_server.poll()
+    assert license_server.checker is checker
+
+
+def test_socket(license_server, env, tmp_path):
+    _, requirements, _ = env
+    socket_path = str(tmp_path.joinpath("liccheck.sock"))
+    server = UnixSocketServer(socket_path, license_server)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        assert client.request({"command": "ping"}, socket_path)["pid"] == os.getpid()
+        result = client.check(str(requirements), socket_path)
+        assert result["passed"]
+        start = time.perf_counter()
+        assert client.check(str(requirements), socket_path) == result
+        assert time.perf_counter() - start < 0.1
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        with pytest.raises(client.ServerError, match="FileNotFoundError"):
+            client.check(str(tmp_path.joinpath("missing.txt")), socket_path)
+        secret = tmp_path.joinpath("passwd")
+        secret.write_text("root:secretpasswordhash:1234\n")
+        with pytest.raises(client.ServerError, match="passwd:1: invalid") as e:
+            client.check(str(secret), socket_path)
+        assert "secret" not in str(e.value)
+        with pytest.raises(client.ServerError, match="unknown command"):
+            client.request({"command": "unknown"}, socket_path)
+        assert client.request({"command": "shutdown"}, socket_path)["shutdown"]
+        thread.join(5)
+        assert not thread.is_alive()
+    finally:
+        if thread.is_alive():
+            server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_client_unreachable(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(
+        "sys.argv",
+        ["liccheck-client", "--socket", str(tmp_path.joinpath("none.sock"))],
+    )
+    assert client.main() == 2
+    assert "liccheck daemon" in capsys.readouterr().err
+
+
+def test_parse_serve_args():
+    args = parse_args(["--serve"])
+    assert args.serve == client.default_socket_path()
+    assert args.poll_interval == 1.0
+    assert parse_args(["--serve", "/tmp/x.sock"]).serve == "/tmp/x.sock"
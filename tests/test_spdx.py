@@ -0,0 +1,74 @@
+import pytest
+
+from liccheck import spdx
+from liccheck.command_line import Level, Reason, Strategy, check_package
+
+
+@pytest.mark.parametrize(
+    ("expression", "options"),
+    [
+        ("MIT", [["mit"]]),
+        ("MIT OR Apache-2.0", [["mit"], ["apache-2.0"]]),
+        ("(MIT AND Apache-2.0) OR BSD-3-Clause", [["mit", "apache-2.0"], ["bsd-3-clause"]]),
+        ("MIT AND (Apache-2.0 OR BSD-3-Clause)", [["mit", "apache-2.0"], ["mit", "bsd-3-clause"]]),
+        ("Apache-2.0 WITH LLVM-exception", [["apache-2.0 with llvm-exception"]]),
+        ("GPL-2.0+ AND LicenseRef-Proprietary", [["gpl-2.0+", "licenseref-proprietary"]]),
+    ],
+)
+def test_parse(expression, options):
+    tree = spdx.parse(expression)
+    assert [[spdx.term_name(t) for t in o] for o in spdx.to_options(tree)] == options
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "GNU Library or Lesser General Public License (LGPL)",
+        "Apache 2.0",
+        "MIT OR",
+        "(MIT",
+        "MIT)",
+        "(MIT OR Apache-2.0) WITH LLVM-exception",
+        "",
+    ],
+)
+def test_parse_error(expression):
+    with pytest.raises(spdx.ParseError):
+        spdx.parse(expression)
+
+
+def test_normalize_license():
+    assert spdx.normalize_license("Apache Software License") == "Apache-2.0"
+    assert spdx.normalize_license("apache-2.0") == "Apache-2.0"
+    assert spdx.normalize_license("MIT  License") == "MIT"
+    assert spdx.normalize_license("BSD License") is None
+
+
+def make_strategy(authorized, unauthorized=()):
+    return Strategy(
+        authorized_licenses=list(authorized),
+        unauthorized_licenses=list(unauthorized),
+        authorized_packages={},
+    )
+
+
+@pytest.mark.parametrize(
+    ("license", "level", "reason"),
+    [
+        ("(MIT AND Apache-2.0) OR BSD-3-Clause", Level.STANDARD, Reason.OK),
+        ("MIT AND GPL-3.0-only", Level.STANDARD, Reason.UNAUTHORIZED),
+        ("MIT AND LicenseRef-Other", Level.STANDARD, Reason.UNKNOWN),
+        ("MIT OR GPL-3.0-only", Level.STANDARD, Reason.OK),
+        ("MIT OR GPL-3.0-only", Level.CAUTIOUS, Reason.UNAUTHORIZED),
+        ("Apache-2.0 WITH LLVM-exception", Level.PARANOID, Reason.OK),
+        ("GPL-3.0-only WITH GCC-exception-3.1", Level.STANDARD, Reason.OK),
+        ("GPL-3.0-only WITH Other-exception", Level.STANDARD, Reason.UNAUTHORIZED),
+    ],
+)
+def test_check_package_evaluates_expressions(license, level, reason):
+    strategy = make_strategy(
+        ["mit license", "apache software license", "gpl-3.0-only with gcc-exception-3.1"],
+        ["gpl v3"],
+    )
+    package = {"name": "example", "version": "1", "licenses": [license]}
+    assert check_package(strategy, package, level) is reason
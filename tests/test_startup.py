@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+
+# imported only by the phases needing them
+DEFERRED_MODULES = (
+    "concurrent.futures",
+    "csv",
+    "importlib.metadata",
+    "packaging.requirements",
+    "packaging.version",
+    "pip",
+    "pkg_resources",
+    "semantic_version",
+    "socket",
+    "toml",
+    "tomllib",
+)
+# cumulative import time of liccheck.command_line, a few times what it takes
+# on a developer machine, to catch a heavy import coming back
+IMPORT_BUDGET_US = int(os.environ.get("LICCHECK_IMPORT_BUDGET_US", 100000))
+
+SCRIPT = """
+import json, sys
+baseline = set(sys.modules)
+import liccheck.command_line
+from liccheck.command_line import Strategy
+Strategy.from_config(sys.argv[1])
+print(json.dumps({"baseline": sorted(baseline), "modules": sorted(sys.modules)}))
+"""
+
+
+def run_python(*args):
+    env = dict(os.environ)
+    # measure with cached bytecode, as an installed liccheck runs
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run(
+        [sys.executable] + list(args),
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def import_time(stderr, module):
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError("no import time of {}".format(module))
+
+
+def test_deferred_modules_are_not_imported(tmp_path):
+    strategy = tmp_path.joinpath("strategy.ini")
+    strategy.write_text("[Licenses]\nauthorized_licenses:\n    mit\n")
+    result = json.loads(run_python("-c", SCRIPT, str(strategy)).stdout)
+    # modules imported by the interpreter startup, e.g. by .pth files, aren't
+    # liccheck's doing
+    imported = set(result["modules"]) - set(result["baseline"])
+    assert sorted(imported.intersection(DEFERRED_MODULES)) == []
+
+
+def test_import_time_budget():
+    run_python("-c", "import liccheck.command_line")  # write the bytecode
+    best = min(
+        import_time(
+            run_python("-X", "importtime", "-c", "import liccheck.command_line").stderr,
+            "liccheck.command_line",
+        )
+        for _ in range(3)
+    )
+    assert best < IMPORT_BUDGET_US
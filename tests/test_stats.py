@@ -0,0 +1,78 @@
+import json
+import pstats
+
+from liccheck.command_line import parse_args, run
+from liccheck.stats import NULL_STATS, Stats
+
+
+def test_phases_are_accumulated():
+    stats = Stats()
+    stats.add_time("check", 0.5)
+    with stats.timer("report"):
+        pass
+    stats.add_time("check", 0.25)
+    assert list(stats.phases) == ["check", "report"]
+    assert stats.phases["check"] == 0.75
+
+
+def test_slowest_distributions():
+    stats = Stats(top=2)
+    for name, seconds in [("a", 0.1), ("b", 0.3), ("c", 0.2), ("d", 0.05)]:
+        stats.record_distribution(name, seconds)
+    stats.count("metadata_reads", 4)
+    assert stats.to_dict() == {
+        "phases": {},
+        "counters": {"metadata_reads": 4},
+        "slowest_distributions": [
+            {"name": "b", "seconds": 0.3},
+            {"name": "c", "seconds": 0.2},
+        ],
+        "peak_memory": None,
+    }
+
+
+def test_trace_memory():
+    stats = Stats(trace_memory=True)
+    stats.start()
+    data = [bytearray(1024) for _ in range(100)]
+    stats.stop()
+    assert stats.peak_memory >= 100 * 1024
+    assert "peak memory" in stats.format()
+    del data
+
+
+def test_null_stats():
+    with NULL_STATS.timer("check"):
+        NULL_STATS.count("metadata_reads")
+        NULL_STATS.record_distribution("a", 1)
+    assert NULL_STATS.to_dict()["phases"] == {}
+    assert not NULL_STATS.counters
+
+
+def test_run_with_stats(tmp_path, capsys):
+    stats_file = tmp_path.joinpath("stats.json")
+    args = parse_args(
+        ["-s", "liccheck.ini", "-r", "requirements.txt", "--stats",
+         "--stats-file", str(stats_file)]
+    )
+    assert run(args) == 0
+    output = capsys.readouterr().out
+    assert "statistics:\nphases:\n    config" in output
+    stats = json.loads(stats_file.read_text())
+    assert {"parse", "resolve", "metadata", "check"} <= set(stats["phases"])
+    assert stats["counters"]["metadata_reads"] == 3
+    assert stats["counters"]["packages_checked"] == 3
+    assert stats["counters"]["distributions_scanned"] >= 3
+    assert stats["counters"]["metadata_bytes_read"] > 0
+    assert stats["counters"]["license_classifications"] >= 1
+    assert len(stats["slowest_distributions"]) == 3
+
+
+def test_run_with_profile(tmp_path, capsys):
+    profile = tmp_path.joinpath("liccheck.prof")
+    args = parse_args(
+        ["-s", "liccheck.ini", "-r", "requirements.txt", "--profile", str(profile)]
+    )
+    assert run(args) == 0
+    assert "profile written to" in capsys.readouterr().out
+    assert pstats.Stats(str(profile)).total_calls > 0
@@ -0,0 +1,100 @@
+import zipfile
+
+import pytest
+from packaging.requirements import Requirement
+
+from liccheck.cache import distribution_key
+from liccheck.command_line import get_packages_info, parse_args, run
+from liccheck.requirements import (
+    DistributionIndex,
+    find_distributions,
+    parse_metadata_dirname,
+    resolve,
+)
+from liccheck.wheel import WheelDistribution
+
+
+def make_wheel(directory, name, version, requires=(), license="MIT"):
+    stem = "{}-{}".format(name.replace("-", "_"), version)
+    path = directory.joinpath(stem + "-py3-none-any.whl")
+    with zipfile.ZipFile(str(path), "w") as wheel:
+        wheel.writestr(name.replace("-", "_") + "/__init__.py", "")
+        wheel.writestr(
+            stem + ".dist-info/METADATA",
+            "Metadata-Version: 2.1\nName: {}\nVersion: {}\nLicense: {}\n{}\n"
+            "Long description\n".format(
+                name,
+                version,
+                license,
+                "".join("Requires-Dist: {}\n".format(r) for r in requires),
+            ),
+        )
+        wheel.writestr(stem + ".dist-info/RECORD", "")
+    return path
+
+
+@pytest.fixture
+def wheels(tmp_path):
+    make_wheel(tmp_path, "app", "1.0", ["lib-a>=2"])
+    make_wheel(tmp_path, "lib-a", "2.0", ["lib-b"], license="BSD")
+    make_wheel(tmp_path, "lib-b", "3.0", license="GPL v3")
+    return tmp_path
+
+
+def test_wheel_distribution(wheels):
+    dist = WheelDistribution(wheels.joinpath("lib_a-2.0-py3-none-any.whl"))
+    assert dist.metadata_dir == "lib_a-2.0.dist-info"
+    assert parse_metadata_dirname(dist) == ("lib_a", "2.0")
+    assert dist.metadata["Name"] == "lib-a"
+    assert dist.read_text("missing") is None
+    assert distribution_key(dist).startswith("lib-a|2.0|")
+
+
+def test_find_distributions(wheels, tmp_path_factory):
+    site_packages = tmp_path_factory.mktemp("site-packages")
+    dist_info = site_packages.joinpath("other-1.0.dist-info")
+    dist_info.mkdir()
+    dist_info.joinpath("METADATA").write_text("Name: other\nVersion: 1.0\n")
+    paths = [
+        str(site_packages),
+        str(dist_info),
+        str(wheels),
+        str(wheels.joinpath("app-1.0-py3-none-any.whl")),
+    ]
+    names = [dist.metadata["Name"] for dist in find_distributions(paths)]
+    assert names == ["other", "other", "app", "lib-a", "lib-b", "app"]
+    assert len(DistributionIndex(paths)) == 4
+
+
+def test_resolve_wheels(wheels):
+    index = DistributionIndex([str(wheels)])
+    dists = list(resolve([Requirement("app")], index=index))
+    assert [dist.metadata["Name"] for dist in dists] == ["app", "lib-a", "lib-b"]
+
+
+def test_get_packages_info_from_wheels(wheels, tmpfile):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("app\n")
+    tmpfh.close()
+    packages = get_packages_info(tmppath, index=DistributionIndex([str(wheels)]))
+    assert [(p.name, p.licenses) for p in packages] == [
+        ("app", ("MIT",)),
+        ("lib-a", ("BSD",)),
+        ("lib-b", ("GPL v3",)),
+    ]
+    assert packages[0].location == str(wheels.joinpath("app-1.0-py3-none-any.whl"))
+    assert packages[1].dependencies == ("lib-b",)
+
+
+def test_run_with_paths(wheels, tmpfile, capsys):
+    tmpfh, tmppath = tmpfile
+    tmpfh.write("app\n")
+    tmpfh.close()
+    args = parse_args(
+        ["--sfile", "liccheck.ini", "-r", tmppath, "--path", str(wheels)]
+    )
+    assert args.paths == [str(wheels)]
+    assert run(args) == -1
+    captured = capsys.readouterr().out
+    assert "3 packages and dependencies." in captured
+    assert "lib-b (3.0): ['GPL v3']" in captured
@@ -1,4 +1,10 @@
-from liccheck.command_line import write_packages
+import pytest
+
+from liccheck.command_line import (
+    build_reverse_dependencies,
+    find_dependency_paths,
+    write_packages,
+)
 
 
 def test_write_packages(capsys):
@@ -54,3 +60,68 @@ def test_write_packages_without_deps(capsys):
     captured = capsys.readouterr().out
     expected = "    functools32 (3.2.3-2): ['PSF license']\n"
     assert captured == expected
+
+
+def test_write_packages_matches_normalized_dependency_names(capsys):
+    packages = [
+        {'name': 'semantic-version', 'version': '2.10.0', 'location': 'path',
+         'dependencies': [], 'licenses': ['BSD']},
+        {'name': 'liccheck', 'version': '0.9.3', 'location': 'path',
+         'dependencies': ['Semantic_Version'], 'licenses': ['Apache2']}]
+
+    write_packages([packages[0]], packages)
+
+    captured = capsys.readouterr().out
+    expected = '''    semantic-version (2.10.0): ['BSD']
+      dependency:
+          semantic-version << liccheck
+'''
+    assert captured == expected
+
+
+@pytest.fixture
+def diamond():
+    return [
+        {'name': 'a', 'version': '1', 'location': 'path',
+         'dependencies': ['b', 'c'], 'licenses': ['MIT']},
+        {'name': 'b', 'version': '1', 'location': 'path',
+         'dependencies': ['d'], 'licenses': ['MIT']},
+        {'name': 'c', 'version': '1', 'location': 'path',
+         'dependencies': ['d'], 'licenses': ['MIT']},
+        {'name': 'd', 'version': '1', 'location': 'path',
+         'dependencies': [], 'licenses': ['GPL']}]
+
+
+def test_find_dependency_paths(diamond):
+    reverse_dependencies = build_reverse_dependencies(diamond)
+    assert find_dependency_paths('d', reverse_dependencies) == (
+        [('d', 'b', 'a'), ('d', 'c', 'a')], 0)
+    assert find_dependency_paths('d', reverse_dependencies, max_paths=1) == (
+        [('d', 'b', 'a')], 1)
+    assert find_dependency_paths('d', reverse_dependencies, max_depth=1) == (
+        [('d', 'b', '...'), ('d', 'c', '...')], 0)
+    assert find_dependency_paths('d', reverse_dependencies, shortest=True) == (
+        [('d', 'b', 'a')], 1)
+
+
+def test_find_shortest_dependency_path_in_cycle():
+    packages = [
+        {'name': 'a', 'version': '1', 'location': 'path',
+         'dependencies': ['b'], 'licenses': ['MIT']},
+        {'name': 'b', 'version': '1', 'location': 'path',
+         'dependencies': ['a'], 'licenses': ['GPL']}]
+    reverse_dependencies = build_reverse_dependencies(packages)
+    assert find_dependency_paths('b', reverse_dependencies, shortest=True) == (
+        [('b', 'a', 'b')], 0)
+
+
+def test_write_packages_with_max_paths(capsys, diamond):
+    write_packages([diamond[3]], diamond, max_paths=1)
+
+    captured = capsys.readouterr().out
+    expected = '''    d (1): ['GPL']
+      dependencies:
+          d << b << a
+          (1 more dependency path elided)
+'''
+    assert captured == expected